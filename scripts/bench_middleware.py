@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: per-request overhead of RequestID + Metrics middleware.
+Compares the old BaseHTTPMiddleware versions with the pure-ASGI ones by calling
+the ASGI app in-process (no network, no DB), so only framework overhead is measured.
+
+Usage: uv run python scripts/bench_middleware.py [requests]
+"""
+import os
+import sys
+
+# Add project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import logging
+import time
+import uuid
+
+from fastapi import FastAPI
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.request_id import RequestIDMiddleware
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    """Previous BaseHTTPMiddleware implementation (baseline)."""
+
+    async def dispatch(self, request, call_next):
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        request.state.request_id = request_id
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+
+class LegacyMetricsMiddleware(BaseHTTPMiddleware):
+    """Previous BaseHTTPMiddleware implementation (baseline)."""
+
+    async def dispatch(self, request, call_next):
+        start = time.perf_counter()
+        response = await call_next(request)
+        duration_ms = (time.perf_counter() - start) * 1000
+        _ = duration_ms, getattr(request.state, "request_id", None), response.status_code
+        return response
+
+
+def build_app(request_id_cls=None, metrics_cls=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/jobs/{job_id}")
+    async def get_job(job_id: str) -> dict:
+        return {"id": job_id, "status": "completed"}
+
+    if metrics_cls:
+        app.add_middleware(metrics_cls)
+    if request_id_cls:
+        app.add_middleware(request_id_cls)
+    return app
+
+
+async def run(app: FastAPI, n: int) -> float:
+    """Mean microseconds per request over n in-process requests."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/jobs/123",
+        "raw_path": b"/jobs/123",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(min(n, 500)):  # warm-up
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n * 1e6
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    # Exclude log I/O: both variants would pay it equally.
+    logging.getLogger("src.middleware.metrics").setLevel(logging.WARNING)
+
+    none = await run(build_app(), n)
+    legacy = await run(build_app(LegacyRequestIDMiddleware, LegacyMetricsMiddleware), n)
+    asgi = await run(build_app(RequestIDMiddleware, MetricsMiddleware), n)
+
+    print(f"requests: {n}")
+    print(f"no middleware:         {none:8.1f} us/req")
+    print(f"BaseHTTPMiddleware x2: {legacy:8.1f} us/req  (+{legacy - none:.1f} us)")
+    print(f"pure ASGI x2:          {asgi:8.1f} us/req  (+{asgi - none:.1f} us)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
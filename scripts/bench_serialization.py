@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: serializing a GET /jobs page of 100 jobs.
+Compares the previous path (dict -> JobResponse per row -> response_model re-validation -> stdlib
+JSON) with the current one (projected row dicts rendered by orjson via FastJSONResponse), by calling
+the ASGI app in-process (no network, no DB). Also times jsonb decoding (stdlib json vs orjson).
+
+Usage: uv run python scripts/bench_serialization.py [pages]
+"""
+import os
+import sys
+
+# Add project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+import json
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from fastapi import FastAPI
+
+from src.api.responses import FastJSONResponse
+from src.models.jobs.job import JOB_FIELDS, JOB_SUMMARY_FIELDS, JobListResponse, JobResponse
+from src.utils import serialization
+
+PAGE_SIZE = 100
+
+
+def make_rows(n: int) -> list[dict]:
+    """Rows shaped like asyncpg records after dict(): UUIDs, aware datetimes, decoded JSONB."""
+    now = datetime.now(UTC)
+    user_id = uuid.uuid4()
+    return [
+        {
+            "id": uuid.uuid4(),
+            "job_type": "sample_task",
+            "status": "completed",
+            "priority": "interactive",
+            "user_id": user_id,
+            "job_parameters": {
+                "source": f"s3://bucket/input/{i}.csv",
+                "options": {"rows": 1000, "dry_run": False},
+            },
+            "retry_count": 0,
+            "created_at": now - timedelta(seconds=i),
+            "updated_at": now,
+            "started_at": now - timedelta(seconds=i / 2),
+            "completed_at": now,
+            "error_message": None,
+            "error_type": None,
+            "data_references": {"output": f"s3://bucket/output/{i}.parquet", "rows": 1000},
+        }
+        for i in range(n)
+    ]
+
+
+def build_app(rows: list[dict]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/legacy", response_model=JobListResponse)
+    async def legacy() -> JobListResponse:
+        # Previous route: SELECT *, JobResponse(**row) per row, then FastAPI validates the
+        # response model again.
+        return JobListResponse(items=[JobResponse(**r) for r in rows], total=None, next_cursor=None)
+
+    full = [{c: r[c] for c in JOB_FIELDS} for r in rows]
+    summary = [{c: r[c] for c in JOB_SUMMARY_FIELDS} for r in rows]
+
+    @app.get("/full", response_model=JobListResponse)
+    async def fast_full() -> FastJSONResponse:
+        return FastJSONResponse({"items": full, "total": None, "next_cursor": None})
+
+    @app.get("/summary", response_model=JobListResponse)
+    async def fast_summary() -> FastJSONResponse:
+        return FastJSONResponse({"items": summary, "total": None, "next_cursor": None})
+
+    return app
+
+
+async def run(app: FastAPI, path: str, n: int) -> tuple[float, int]:
+    """(mean microseconds per request, response body bytes) over n in-process requests."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1),
+        "server": ("bench", 80),
+    }
+    body_size = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal body_size
+        if message["type"] == "http.response.body":
+            body_size = len(message.get("body", b""))
+
+    for _ in range(min(n, 50)):  # warm-up
+        await app(dict(scope), receive, send)
+    start = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / n * 1e6, body_size
+
+
+def bench_decode(rows: list[dict], n: int) -> tuple[float, float]:
+    """Mean microseconds to decode one page's JSONB values: stdlib json vs orjson."""
+    docs = [json.dumps(r[c]) for r in rows for c in ("job_parameters", "data_references")]
+    start = time.perf_counter()
+    for _ in range(n):
+        for d in docs:
+            json.loads(d)
+    stdlib = (time.perf_counter() - start) / n * 1e6
+    encoded = [d.encode() for d in docs]
+    start = time.perf_counter()
+    for _ in range(n):
+        for d in encoded:
+            serialization.loads(d)
+    return stdlib, (time.perf_counter() - start) / n * 1e6
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rows = make_rows(PAGE_SIZE)
+    app = build_app(rows)
+
+    legacy, legacy_bytes = await run(app, "/legacy", n)
+    full, full_bytes = await run(app, "/full", n)
+    summary, summary_bytes = await run(app, "/summary", n)
+    stdlib_decode, orjson_decode = bench_decode(rows, n)
+
+    print(f"pages: {n} x {PAGE_SIZE} jobs")
+    print(f"pydantic x2 + json (full):  {legacy:9.1f} us/page  {legacy_bytes:7d} bytes")
+    print(
+        f"orjson, no revalidation:    {full:9.1f} us/page  {full_bytes:7d} bytes  "
+        f"({legacy / full:.1f}x)"
+    )
+    print(
+        f"orjson, summary fields:     {summary:9.1f} us/page  {summary_bytes:7d} bytes  "
+        f"({legacy / summary:.1f}x)"
+    )
+    print(f"jsonb decode stdlib json:   {stdlib_decode:9.1f} us/page")
+    print(
+        f"jsonb decode orjson:        {orjson_decode:9.1f} us/page  "
+        f"({stdlib_decode / orjson_decode:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Run the PGMQ job consumer locally (Ctrl+C to drain and stop)."""
+import os
+import sys
+
+# Add project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import asyncio
+import signal
+
+from src.config.database import close_pool, set_pool_role
+from src.services.job_queue.consumer import run_consumer
+
+
+async def main() -> None:
+    """Consume until SIGINT/SIGTERM, then finish in-flight jobs."""
+    set_pool_role("worker")
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    try:
+        await run_consumer(stop)
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
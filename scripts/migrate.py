@@ -1,7 +1,15 @@
 #!/usr/bin/env python3
 """
-Idempotent database migration script.
-Creates jobs table, PGMQ extension, and job_queue.
+Versioned database migrations.
+
+Applies each migration in MIGRATIONS not yet recorded in public.schema_migrations, in order, then
+ensures upcoming jobs partitions and one PGMQ queue per (tier, priority) lane. Transactional
+migrations run in a transaction with their version row; the others (CREATE INDEX CONCURRENTLY)
+run in autocommit and must be safe to re-run if interrupted. Append new migrations; never edit
+applied ones. Through SESSION_POOLER_URL, concurrent runs queue on an advisory lock.
+
+    python scripts/migrate.py            # apply pending migrations
+    python scripts/migrate.py --status   # list applied and pending versions
 """
 import os
 import sys
@@ -10,14 +18,53 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import asyncio
+from collections.abc import Awaitable, Callable
+
 import asyncpg
 
+from src.services.job_queue.partitions import (
+    JOBS_ARCHIVE_SQL,
+    create_index_concurrently,
+    ensure_partitions,
+)
+from src.services.job_queue.queue import all_queue_names
+
+# Partitions created up front; the daily maintain_job_storage run keeps extending them.
+PARTITION_MONTHS_AHEAD = 3
+# pg_advisory_lock key held for the whole run.
+MIGRATION_LOCK_ID = 0x6A6F6273  # "jobs"
+
 
+# A pre-partitioning public.jobs heap is renamed and later attached as one partition covering
+# all its rows. Indexes matching a partitioned index are renamed out of the way rather than
+# dropped: ATTACH adopts them instead of rebuilding them under its exclusive lock, so only the
+# new primary key is built.
+LEGACY_JOBS_SQL = """
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE oid = to_regclass('public.jobs') AND relkind = 'r') THEN
+        ALTER TABLE public.jobs
+            ADD COLUMN IF NOT EXISTS priority TEXT NOT NULL DEFAULT 'interactive';
+        ALTER TABLE public.jobs RENAME TO jobs_legacy;
+        ALTER TABLE public.jobs_legacy DROP CONSTRAINT IF EXISTS jobs_pkey;
+        ALTER INDEX IF EXISTS public.jobs_status_idx RENAME TO jobs_legacy_status_idx;
+        ALTER INDEX IF EXISTS public.jobs_user_created_id_idx
+            RENAME TO jobs_legacy_user_created_id_idx;
+        ALTER INDEX IF EXISTS public.jobs_user_processing_idx
+            RENAME TO jobs_legacy_user_processing_idx;
+        DROP INDEX IF EXISTS public.jobs_user_id_idx, public.jobs_created_at_idx;
+    END IF;
+END $$;
+"""
+
+# Range-partitioned by month on created_at (partitions: src/services/job_queue/partitions.py).
+# The primary key must include the partition key.
 JOBS_TABLE_SQL = """
 CREATE TABLE IF NOT EXISTS public.jobs (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     job_type TEXT NOT NULL,
     status TEXT NOT NULL DEFAULT 'pending',
+    priority TEXT NOT NULL DEFAULT 'interactive',
     user_id UUID NOT NULL,
     job_parameters JSONB,
     error_message TEXT,
@@ -28,39 +75,181 @@ CREATE TABLE IF NOT EXISTS public.jobs (
     created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
     started_at TIMESTAMPTZ,
-    completed_at TIMESTAMPTZ
-);
+    completed_at TIMESTAMPTZ,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
 
 CREATE INDEX IF NOT EXISTS jobs_status_idx ON public.jobs (status);
-CREATE INDEX IF NOT EXISTS jobs_user_id_idx ON public.jobs (user_id);
-CREATE INDEX IF NOT EXISTS jobs_created_at_idx ON public.jobs (created_at);
+-- Keyset pagination for list_jobs:
+--   WHERE user_id = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS jobs_user_created_id_idx
+    ON public.jobs (user_id, created_at DESC, id DESC);
+-- Per-user in-flight cap (claim_job): count of a user's processing jobs
+CREATE INDEX IF NOT EXISTS jobs_user_processing_idx
+    ON public.jobs (user_id) WHERE status = 'processing';
+"""
+
+# Attach jobs_legacy for everything before next month; monthly partitions take over from there.
+# The NOT VALID + VALIDATE check lets ATTACH skip its own full-table scan under an exclusive lock.
+ATTACH_LEGACY_SQL = """
+DO $$
+DECLARE
+    bound TIMESTAMPTZ := date_trunc('month', NOW()) + INTERVAL '1 month';
+BEGIN
+    IF to_regclass('public.jobs_legacy') IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM pg_inherits WHERE inhrelid = 'public.jobs_legacy'::regclass
+    ) THEN
+        EXECUTE format(
+            'ALTER TABLE public.jobs_legacy ADD CONSTRAINT jobs_legacy_range '
+            'CHECK (created_at < %L) NOT VALID',
+            bound
+        );
+        ALTER TABLE public.jobs_legacy VALIDATE CONSTRAINT jobs_legacy_range;
+        EXECUTE format(
+            'ALTER TABLE public.jobs ATTACH PARTITION public.jobs_legacy '
+            'FOR VALUES FROM (MINVALUE) TO (%L)',
+            bound
+        );
+        ALTER TABLE public.jobs_legacy DROP CONSTRAINT jobs_legacy_range;
+    END IF;
+END $$;
+"""
+
+
+SCHEMA_MIGRATIONS_SQL = """
+CREATE TABLE IF NOT EXISTS public.schema_migrations (
+    version INT PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
 """
 
 
-async def migrate():
+async def _baseline(conn: asyncpg.Connection) -> None:
+    """PGMQ extension, partitioned jobs table (converting a pre-partitioning heap) and jobs_archive.
+
+    Idempotent, so databases created by the pre-versioning script record it without changes.
+    """
+    await conn.execute("CREATE EXTENSION IF NOT EXISTS pgmq")
+    await conn.execute(LEGACY_JOBS_SQL)
+    await conn.execute(JOBS_TABLE_SQL)
+    await conn.execute(ATTACH_LEGACY_SQL)
+    # Later index migrations build per partition, so the first partitions must exist first.
+    await ensure_partitions(conn, PARTITION_MONTHS_AHEAD)
+    await conn.execute(JOBS_ARCHIVE_SQL)
+
+
+async def _processing_updated_idx(conn: asyncpg.Connection) -> None:
+    """recover_stuck_jobs: status = 'processing' ... ORDER BY updated_at."""
+    await create_index_concurrently(
+        conn, "jobs_processing_updated_idx", "(updated_at) WHERE status = 'processing'"
+    )
+
+
+async def _pending_updated_idx(conn: asyncpg.Connection) -> None:
+    """recover_orphaned_jobs: status = 'pending' AND updated_at < ? ORDER BY updated_at.
+
+    Keyed on updated_at rather than created_at: a retried job is re-queued long after it was
+    created.
+    """
+    await create_index_concurrently(
+        conn, "jobs_pending_updated_idx", "(updated_at) WHERE status = 'pending'"
+    )
+
+
+async def _user_status_created_idx(conn: asyncpg.Connection) -> None:
+    """list_jobs?status=: user_id = ? AND status = ? ORDER BY created_at DESC, id DESC (keyset)."""
+    await create_index_concurrently(
+        conn, "jobs_user_status_created_idx", "(user_id, status, created_at DESC, id DESC)"
+    )
+
+
+async def _drop_status_idx(conn: asyncpg.Connection) -> None:
+    """jobs_status_idx is superseded by the partial indexes.
+
+    A low-selectivity index only adds write cost.
+    """
+    await conn.execute("DROP INDEX IF EXISTS public.jobs_status_idx")
+
+
+async def _heartbeat_at(conn: asyncpg.Connection) -> None:
+    """Liveness for processing jobs (heartbeats.py).
+
+    Nullable without a default, so adding it does not rewrite the table.
+    """
+    await conn.execute("ALTER TABLE public.jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ")
+
+
+# (version, name, migration, transactional)
+MIGRATIONS: list[tuple[int, str, Callable[[asyncpg.Connection], Awaitable[None]], bool]] = [
+    (1, "baseline", _baseline, True),
+    (2, "jobs_processing_updated_idx", _processing_updated_idx, False),
+    (3, "jobs_pending_updated_idx", _pending_updated_idx, False),
+    (4, "jobs_user_status_created_idx", _user_status_created_idx, False),
+    (5, "drop_jobs_status_idx", _drop_status_idx, True),
+    (6, "jobs_heartbeat_at", _heartbeat_at, True),
+]
+
+
+async def applied_versions(conn: asyncpg.Connection) -> set[int]:
+    """Versions recorded in public.schema_migrations."""
+    await conn.execute(SCHEMA_MIGRATIONS_SQL)
+    return {r["version"] for r in await conn.fetch("SELECT version FROM public.schema_migrations")}
+
+
+async def migrate(status_only: bool = False):
     """Run migrations."""
-    url = os.environ.get("TRANSACTION_POOLER_URL")
+    # CREATE INDEX CONCURRENTLY runs in autocommit, so either pooler works;
+    # prefer the session pooler.
+    session_url = os.environ.get("SESSION_POOLER_URL")
+    url = session_url or os.environ.get("TRANSACTION_POOLER_URL")
     if not url:
-        print("ERROR: TRANSACTION_POOLER_URL not set")
+        print("ERROR: neither SESSION_POOLER_URL nor TRANSACTION_POOLER_URL is set")
         sys.exit(1)
 
-    conn = await asyncpg.connect(url)
+    conn = await asyncpg.connect(url, statement_cache_size=0)
 
     try:
-        # PGMQ extension
-        await conn.execute("CREATE EXTENSION IF NOT EXISTS pgmq")
-        print("✓ PGMQ extension ready")
+        # One runner at a time (e.g. two deploys racing). The lock is session-scoped, so it spans
+        # the autocommit steps and is released when the connection closes, even if the run fails.
+        # A transaction-mode pooler could leave it held on a pooled server connection, so it is
+        # only taken on a session connection.
+        if session_url:
+            await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+        else:
+            print(
+                "WARNING: SESSION_POOLER_URL not set; "
+                "concurrent migration runs are not serialized"
+            )
+        applied = await applied_versions(conn)
+        if status_only:
+            for version, name, _, _ in MIGRATIONS:
+                print(f"{'✓' if version in applied else ' '} {version:04d} {name}")
+            return
+
+        for version, name, run, transactional in MIGRATIONS:
+            if version in applied:
+                continue
+            record = "INSERT INTO public.schema_migrations (version, name) VALUES ($1, $2)"
+            if transactional:
+                async with conn.transaction():
+                    await run(conn)
+                    await conn.execute(record, version, name)
+            else:
+                await run(conn)
+                await conn.execute(record, version, name)
+            print(f"✓ {version:04d} {name}")
 
-        # Jobs table
-        await conn.execute(JOBS_TABLE_SQL)
-        print("✓ jobs table ready")
+        created = await ensure_partitions(conn, PARTITION_MONTHS_AHEAD)
+        print(f"✓ jobs partitions ready (new: {', '.join(created) or 'none'})")
 
-        # PGMQ queue
-        try:
-            await conn.execute("SELECT pgmq.create('job_queue')")
-        except asyncpg.exceptions.DuplicateObjectError:
-            pass  # Queue already exists
-        print("✓ job_queue ready")
+        # PGMQ queues: one per lane, plus the legacy job_queue and the spawn-mode retry queue
+        for name in all_queue_names():
+            try:
+                await conn.execute("SELECT pgmq.create($1)", name)
+            except asyncpg.exceptions.DuplicateObjectError:
+                pass  # Queue already exists
+            print(f"✓ {name} ready")
 
         print("\nMigration complete.")
     finally:
@@ -71,4 +260,4 @@ if __name__ == "__main__":
     from dotenv import load_dotenv
 
     load_dotenv()
-    asyncio.run(migrate())
+    asyncio.run(migrate(status_only="--status" in sys.argv[1:]))
@@ -1,17 +1,64 @@
 """FastAPI dependencies."""
+import hashlib
+import hmac
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException
+from fastapi import Depends, Header, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jwt import PyJWKClient
 
+from src.config.jwks import get_jwks_cache
 from src.models.config import Settings, load_settings
 from src.models.responses import ValidatedJWTUser
 
 security = HTTPBearer(auto_error=False)
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of verified tokens: sha256(token) -> (user_id, exp).
+
+    Entries expire at the token's exp.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._items: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> str | None:
+        """user_id for a previously verified, unexpired token."""
+        key = self._key(token)
+        item = self._items.get(key)
+        if item is None:
+            return None
+        user_id, exp = item
+        if exp <= time.time():
+            del self._items[key]
+            return None
+        self._items.move_to_end(key)
+        return user_id
+
+    def put(self, token: str, user_id: str, exp: float) -> None:
+        """Remember a verified token until exp."""
+        key = self._key(token)
+        self._items[key] = (user_id, exp)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+
+@lru_cache
+def get_verified_token_cache() -> VerifiedTokenCache:
+    """Get process-wide verified-token cache."""
+    return VerifiedTokenCache(load_settings().jwt_cache_max_size)
+
+
 def get_settings() -> Settings:
     """Get cached settings."""
     return load_settings()
@@ -28,12 +75,15 @@ async def get_validated_jwt_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     token = credentials.credentials
-    settings = load_settings()
-    jwks_url = f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+
+    # Repeat polling with the same token skips signature verification until exp.
+    token_cache = get_verified_token_cache()
+    cached_user_id = token_cache.get(token)
+    if cached_user_id:
+        return ValidatedJWTUser(user_id=cached_user_id)
 
     try:
-        jwks_client = PyJWKClient(jwks_url, cache_jwk_set=True, lifespan=600)
-        signing_key = jwks_client.get_signing_key_from_jwt(token)
+        signing_key = await get_jwks_cache().get_signing_key(token)
         payload = jwt.decode(
             token,
             signing_key.key,
@@ -44,6 +94,8 @@ async def get_validated_jwt_user(
         if not user_id:
             raise HTTPException(status_code=401, detail="Invalid token", headers={"WWW-Authenticate": "Bearer"})
 
+        if payload.get("exp"):
+            token_cache.put(token, user_id, float(payload["exp"]))
         return ValidatedJWTUser(user_id=user_id)
     except jwt.PyJWTError as e:
         raise HTTPException(
@@ -51,3 +103,12 @@ async def get_validated_jwt_user(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
+
+
+def require_admin_token(x_admin_token: Annotated[str | None, Header()] = None) -> None:
+    """Guard admin routes with the ADMIN_TOKEN shared secret (X-Admin-Token header)."""
+    expected = load_settings().admin_token
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=403, detail="Forbidden")
@@ -1,19 +1,55 @@
 """FastAPI application entry point."""
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.responses import FastJSONResponse
+from src.config.database import close_pool, init_pool
+from src.config.jwks import get_jwks_cache
 from src.middleware.metrics import MetricsMiddleware
 from src.middleware.request_id import RequestIDMiddleware
 from src.models.common import ErrorResponse
+from src.models.config import load_settings
+from src.services.job_queue.backends import shutdown_execution_backend
+from src.services.job_queue.consumer import run_retry_dispatcher
+from src.services.job_queue.notifications import get_job_status_listener
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Application lifespan."""
-    yield
+    """Application lifespan: DB pool, JWKS refresh, job status listener and (local backends) retry
+    dispatch; local jobs drained on shutdown."""
+    try:
+        await init_pool()
+    except Exception as e:
+        # Stay up for /health; the pool is retried lazily on first DB call.
+        logger.warning(f"database pool init failed: {e}")
+    jwks = get_jwks_cache()
+    jwks.start()
+    listener = get_job_status_listener()
+    listener.start()
+    # Local backends have no Modal schedule: dispatch spawn-mode retries from the API process.
+    settings = load_settings()
+    retries_stop = asyncio.Event()
+    retries = None
+    if settings.job_dispatch_mode == "spawn" and settings.execution_backend != "modal":
+        retries = asyncio.create_task(run_retry_dispatcher(retries_stop))
+    try:
+        yield
+    finally:
+        retries_stop.set()
+        if retries is not None:
+            await retries
+        await shutdown_execution_backend()
+        await listener.stop()
+        await jwks.stop()
+        await close_pool()
 
 
 app = FastAPI(
@@ -21,6 +57,7 @@ app = FastAPI(
     description="Starter API with jobs and Modal workers",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Middleware order (last added = outermost): RequestID → Metrics → CORS
@@ -28,10 +65,12 @@ app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True,
 app.add_middleware(MetricsMiddleware)
 app.add_middleware(RequestIDMiddleware)
 
-from src.api.routes import health
+from src.api.routes import admin, health, metrics
 from src.api.routes.jobs import router as jobs_router
 
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 app.include_router(jobs_router)
 
 
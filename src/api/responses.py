@@ -0,0 +1,17 @@
+"""Response classes."""
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from src.utils.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    Routes on hot paths return it with plain dicts built from DB rows, skipping response-model
+    validation; UUIDs and datetimes serialize natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
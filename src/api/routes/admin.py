@@ -0,0 +1,26 @@
+"""Admin routes (X-Admin-Token)."""
+from fastapi import APIRouter, Depends
+
+from src.api.dependencies import require_admin_token
+from src.services.job_queue.cache import get_terminal_job_cache
+from src.utils.query_log import get_query_stats, reset_query_stats
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/query-stats")
+async def query_stats() -> dict:
+    """Rolling per-statement DB latency (count, errors, mean, p50/p95/p99) for this process."""
+    return {"statements": get_query_stats()}
+
+
+@router.delete("/query-stats", status_code=204)
+async def clear_query_stats() -> None:
+    """Reset per-statement stats."""
+    reset_query_stats()
+
+
+@router.get("/job-cache")
+async def job_cache_stats() -> dict:
+    """Terminal job cache size and hit/miss counters for this process."""
+    return get_terminal_job_cache().stats()
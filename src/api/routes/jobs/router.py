@@ -1,15 +1,42 @@
 """Jobs API routes."""
+from collections.abc import AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import httpx
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response, StreamingResponse
 
 from src.api.dependencies import get_validated_jwt_user
-from src.models.jobs.job import JobCreateRequest, JobResponse, JobListResponse
+from src.api.responses import FastJSONResponse
+from src.models.jobs.job import (
+    JobBatchCreateRequest,
+    JobBatchCreateResponse,
+    JobBatchItemResult,
+    JobCreateRequest,
+    JobFieldsResponse,
+    JobListResponse,
+    JobResponse,
+    parse_job_fields,
+)
+from src.models.jobs.job_status import JobStatus
 from src.models.responses import ValidatedJWTUser
+from src.services.job_queue import payloads
 from src.services.job_queue.service import JobQueueService
+from src.utils.logging import get_logger
+from src.utils.serialization import dumps
+
+logger = get_logger(__name__)
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
+# SSE streams close after this; clients reconnect if the job is still running.
+JOB_EVENTS_MAX_SECONDS = 300
+
+FIELDS_DESCRIPTION = (
+    '"summary" (no JSONB columns), "full", or a comma-separated list such as '
+    '"id,status,updated_at".'
+)
+
 
 def get_job_queue_service() -> JobQueueService:
     """Get job queue service."""
@@ -28,40 +55,152 @@ async def create_job(
             job_type=request.job_type,
             user_id=current_user.user_id,
             job_parameters=request.job_parameters,
+            priority=request.priority,
         )
         return JobResponse(**job)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/{job_id}", response_model=JobResponse)
+@router.post("/batch", response_model=JobBatchCreateResponse)
+async def create_jobs(
+    request: JobBatchCreateRequest,
+    current_user: ValidatedJWTUser = Depends(get_validated_jwt_user),
+    service: JobQueueService = Depends(get_job_queue_service),
+) -> JobBatchCreateResponse:
+    """Create many jobs in one request; reports success or failure per item."""
+    results = await service.create_jobs(
+        user_id=current_user.user_id,
+        jobs=[(j.job_type, j.job_parameters, j.priority) for j in request.jobs],
+    )
+    items = [
+        JobBatchItemResult(
+            index=i,
+            success=r["error"] is None,
+            job=JobResponse(**r["job"]) if r["job"] else None,
+            error=r["error"],
+        )
+        for i, r in enumerate(results)
+    ]
+    succeeded = sum(1 for item in items if item.success)
+    return JobBatchCreateResponse(items=items, succeeded=succeeded, failed=len(items) - succeeded)
+
+
+@router.get("/{job_id}", response_model=JobFieldsResponse, response_model_exclude_unset=True)
 async def get_job(
     job_id: UUID,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION + ' Default "full".'),
     current_user: ValidatedJWTUser = Depends(get_validated_jwt_user),
     service: JobQueueService = Depends(get_job_queue_service),
-) -> JobResponse:
+) -> Response:
     """Get job by ID (user-scoped)."""
+    try:
+        columns = parse_job_fields(fields, "full")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job = await service.get_job(str(job_id), current_user.user_id, columns)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # The row already has exactly the selected columns; skip model validation.
+    return FastJSONResponse(job)
+
+
+@router.get("/{job_id}/result")
+async def get_job_result(
+    job_id: UUID,
+    current_user: ValidatedJWTUser = Depends(get_validated_jwt_user),
+    service: JobQueueService = Depends(get_job_queue_service),
+) -> Response:
+    """A completed job's data_references as JSON, streamed from storage when it was offloaded."""
     job = await service.get_job(str(job_id), current_user.user_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return JobResponse(**job)
+    if job["status"] != JobStatus.COMPLETED.value:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}, not completed")
+    result = job["data_references"]
+    if payloads.is_ref(result):
+        # Open the download before sending headers, so storage failures still get a proper status.
+        try:
+            body = await payloads.open_stream(result)
+        except payloads.PayloadNotFoundError:
+            raise HTTPException(status_code=404, detail="Job result not found in storage")
+        except httpx.HTTPError as e:
+            logger.error(f"job result fetch failed job_id={job_id} error={e}")
+            raise HTTPException(status_code=502, detail="Job result storage unavailable")
+        return StreamingResponse(body, media_type="application/json")
+    return FastJSONResponse(result or {})
+
+
+@router.get("/{job_id}/wait", response_model=JobResponse)
+async def wait_for_job(
+    job_id: UUID,
+    timeout: float = Query(30, ge=0, le=60, description="Seconds to wait for a terminal status"),
+    current_user: ValidatedJWTUser = Depends(get_validated_jwt_user),
+    service: JobQueueService = Depends(get_job_queue_service),
+) -> Response:
+    """Long-poll: returns when the job completes or fails.
+
+    After timeout, returns the job in its current state.
+    """
+    job = await service.wait_for_job(str(job_id), current_user.user_id, timeout)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return FastJSONResponse(job)
 
 
-@router.get("", response_model=JobListResponse)
+@router.get("/{job_id}/events")
+async def job_events(
+    job_id: UUID,
+    current_user: ValidatedJWTUser = Depends(get_validated_jwt_user),
+    service: JobQueueService = Depends(get_job_queue_service),
+) -> StreamingResponse:
+    """Server-sent events: a `status` event per status change.
+
+    The stream ends once the job is completed or failed.
+    """
+    if not await service.get_job(str(job_id), current_user.user_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream() -> AsyncIterator[str]:
+        events = service.job_events(str(job_id), current_user.user_id, JOB_EVENTS_MAX_SECONDS)
+        async for job in events:
+            if job is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: status\ndata: {dumps(job).decode()}\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("", response_model=JobListResponse, response_model_exclude_unset=True)
 async def list_jobs(
     status: str | None = None,  # noqa: A002
     job_type: str | None = None,
-    limit: int = 20,
-    offset: int = 0,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, description="Deprecated: use cursor"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    include_total: bool = Query(False, description="Also count all matching jobs (slower)"),
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION + ' Default "summary".'),
     current_user: ValidatedJWTUser = Depends(get_validated_jwt_user),
     service: JobQueueService = Depends(get_job_queue_service),
-) -> JobListResponse:
-    """List jobs (user-scoped)."""
-    items, total = await service.list_jobs(
-        user_id=current_user.user_id,
-        status=status,
-        job_type=job_type,
-        limit=limit,
-        offset=offset,
-    )
-    return JobListResponse(items=[JobResponse(**j) for j in items], total=total)
+) -> Response:
+    """List jobs (user-scoped), newest first, with cursor pagination."""
+    try:
+        columns = parse_job_fields(fields, "summary")
+        items, total, next_cursor = await service.list_jobs(
+            user_id=current_user.user_id,
+            status=status,
+            job_type=job_type,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total,
+            columns=columns,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return FastJSONResponse({"items": items, "total": total, "next_cursor": next_cursor})
@@ -0,0 +1,33 @@
+"""Prometheus metrics route (X-Admin-Token)."""
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from src.api.dependencies import require_admin_token
+from src.config.database import get_pool_stats
+from src.services.job_queue import queue
+from src.utils import metrics
+from src.utils.logging import get_logger
+
+# Scrapes hit the DB, so the route is guarded like /admin rather than left open.
+router = APIRouter(tags=["metrics"], dependencies=[Depends(require_admin_token)])
+logger = get_logger(__name__)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def prometheus_metrics() -> PlainTextResponse:
+    """Prometheus scrape endpoint (process-local counters plus pool and queue gauges)."""
+    stats = get_pool_stats()
+    if stats:
+        metrics.DB_POOL_CONNECTIONS.set(stats["size"] - stats["idle"], "in_use")
+        metrics.DB_POOL_CONNECTIONS.set(stats["idle"], "idle")
+        metrics.DB_POOL_CONNECTIONS.set(stats["max"], "max")
+    try:
+        for q in await queue.get_all_queue_metrics():
+            metrics.QUEUE_DEPTH.set(q["queue_length"], q["queue_name"])
+            metrics.QUEUE_OLDEST_AGE.set(q["oldest_msg_age_sec"] or 0, q["queue_name"])
+    except Exception as e:
+        # Still serve process metrics when the DB is unreachable.
+        logger.warning(f"queue metrics unavailable error={e}")
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
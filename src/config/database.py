@@ -1,56 +1,131 @@
-"""Transaction pooler and async database."""
+"""Transaction/session pooler and shared asyncpg pool."""
+import asyncio
+from typing import Literal
+
 import asyncpg
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import sessionmaker
-
-from src.models.config import load_settings
-
-# Convert postgresql:// to postgresql+asyncpg:// for SQLAlchemy
-def _pooler_url() -> str:
-    url = load_settings().transaction_pooler_url
-    if url.startswith("postgresql://"):
-        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
-    return url
-
-
-_engine = None
-_session_factory = None
-
-
-def get_engine():
-    """Get or create async engine."""
-    global _engine
-    if _engine is None:
-        _engine = create_async_engine(
-            _pooler_url(),
-            pool_size=5,
-            max_overflow=10,
-            pool_pre_ping=True,
-            echo=False,
-        )
-    return _engine
-
-
-def get_transaction_session_factory() -> async_sessionmaker[AsyncSession]:
-    """Get async session factory."""
-    global _session_factory
-    if _session_factory is None:
-        _session_factory = async_sessionmaker(
-            get_engine(),
-            class_=AsyncSession,
-            expire_on_commit=False,
-            autoflush=False,
-        )
-    return _session_factory
+
+from src.models.config import Settings, load_settings
+from src.utils import serialization
+from src.utils.logging import get_logger
+from src.utils.query_log import record_query
+
+logger = get_logger(__name__)
+
+# One pool per process: created in the API lifespan, lazily in Modal workers.
+_pool: asyncpg.Pool | None = None
+_pool_lock: asyncio.Lock | None = None
+# "api": many short requests; "worker": long-lived Modal functions and consumers.
+_role: Literal["api", "worker"] = "api"
+
+
+def set_pool_role(role: Literal["api", "worker"]) -> None:
+    """Declare the process role before first DB use.
+
+    DB_CONNECTION_MODE=auto picks the pool mode from it.
+    """
+    global _role
+    _role = role
+
+
+def resolve_pool_mode(settings: Settings) -> Literal["transaction", "session"]:
+    """Effective connection mode.
+
+    In auto mode, workers use the session pooler when SESSION_POOLER_URL is set.
+    """
+    if settings.db_connection_mode != "auto":
+        return settings.db_connection_mode
+    return "session" if _role == "worker" and settings.session_pooler_url else "transaction"
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Per-connection setup: json/jsonb as Python objects, plus per-query timing.
+
+    Both use orjson over the binary wire format.
+    """
+    await conn.set_type_codec(
+        "jsonb",
+        encoder=serialization.encode_jsonb,
+        decoder=serialization.decode_jsonb,
+        schema="pg_catalog",
+        format="binary",
+    )
+    await conn.set_type_codec(
+        "json",
+        encoder=serialization.dumps,
+        decoder=serialization.loads,
+        schema="pg_catalog",
+        format="binary",
+    )
+    conn.add_query_logger(record_query)
+
+
+async def init_pool() -> asyncpg.Pool:
+    """Create the process-wide pool if it does not exist yet."""
+    global _pool, _pool_lock
+    if _pool is not None:
+        return _pool
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            settings = load_settings()
+            mode = resolve_pool_mode(settings)
+            if mode == "session":
+                # Session-scoped server connections keep named prepared statements, so hot
+                # queries (get_job_by_id, transitions) are parsed and planned once per connection.
+                if not settings.session_pooler_url:
+                    # Falling back to the transaction pooler with a statement cache would break.
+                    raise ValueError("DB_CONNECTION_MODE=session requires SESSION_POOLER_URL")
+                url = settings.session_pooler_url
+                statement_cache_size = settings.db_statement_cache_size
+            else:
+                # A transaction-mode pooler may run each transaction on a different server
+                # connection; named prepared statements would not exist there.
+                url = settings.transaction_pooler_url
+                statement_cache_size = 0
+            _pool = await asyncpg.create_pool(
+                url,
+                min_size=settings.db_pool_min_size,
+                max_size=settings.db_pool_max_size,
+                command_timeout=settings.db_command_timeout,
+                statement_cache_size=statement_cache_size,
+                init=_init_connection,
+            )
+            logger.info(
+                f"db pool created mode={mode} role={_role} "
+                f"statement_cache_size={statement_cache_size}"
+            )
+    return _pool
+
+
+async def get_pool() -> asyncpg.Pool:
+    """Get the shared asyncpg pool, creating it on first use."""
+    if _pool is not None:
+        return _pool
+    return await init_pool()
+
+
+async def close_pool() -> None:
+    """Close the shared pool (API shutdown)."""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+def get_pool_stats() -> dict[str, int] | None:
+    """Pool size/idle/max for metrics; None before the pool exists."""
+    if _pool is None:
+        return None
+    return {"size": _pool.get_size(), "idle": _pool.get_idle_size(), "max": _pool.get_max_size()}
 
 
 async def check_transaction_pooler_health() -> bool:
     """Check if transaction pooler is reachable."""
     try:
-        url = load_settings().transaction_pooler_url
-        conn = await asyncpg.connect(url)
-        await conn.execute("SELECT 1")
-        await conn.close()
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute("SELECT 1")
         return True
     except Exception:
         return False
@@ -0,0 +1,98 @@
+"""Process-wide Supabase JWKS cache."""
+import asyncio
+import time
+from functools import lru_cache
+
+import httpx
+import jwt
+from jwt import PyJWK, PyJWKSet
+
+from src.models.config import load_settings
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Minimum gap between on-demand refetches triggered by an unknown kid.
+_MIN_REFETCH_SECONDS = 30
+
+
+class JwksCache:
+    """Signing keys by kid, refreshed in the background.
+
+    An unknown kid (key rotation) triggers one rate-limited refetch.
+    """
+
+    def __init__(self, url: str, refresh_seconds: int) -> None:
+        self._url = url
+        self._refresh_seconds = refresh_seconds
+        self._keys: dict[str, PyJWK] = {}
+        self._fetched_at = 0.0
+        self._lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+
+    async def get_signing_key(self, token: str) -> PyJWK:
+        """Key for the token's kid. Raises jwt.PyJWKClientError when none matches."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(kid)
+        if key is None or time.monotonic() - self._fetched_at > self._refresh_seconds:
+            await self.refresh(force=key is None)
+            key = self._keys.get(kid)
+        if key is None:
+            raise jwt.PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+        return key
+
+    async def refresh(self, force: bool = False) -> None:
+        """Fetch the JWKS unless another caller just did. Keeps stale keys if the fetch fails."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            age = time.monotonic() - self._fetched_at
+            if age < (_MIN_REFETCH_SECONDS if force else self._refresh_seconds):
+                return
+            try:
+                await self._fetch()
+            except Exception as e:
+                if not self._keys:
+                    raise jwt.PyJWKClientConnectionError(
+                        f"Fail to fetch data from the url, err: {e}"
+                    ) from e
+                logger.warning(f"jwks refresh failed, using cached keys error={e}")
+
+    async def _fetch(self) -> None:
+        async with httpx.AsyncClient(timeout=10) as client:
+            resp = await client.get(self._url)
+            resp.raise_for_status()
+        jwk_set = PyJWKSet.from_dict(resp.json())
+        self._keys = {k.key_id: k for k in jwk_set.keys}
+        self._fetched_at = time.monotonic()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self._fetch()
+            except Exception as e:
+                logger.warning(f"jwks background refresh failed error={e}")
+            await asyncio.sleep(self._refresh_seconds / 2)
+
+    def start(self) -> None:
+        """Start background refresh (API lifespan)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        """Stop background refresh."""
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+
+@lru_cache
+def get_jwks_cache() -> JwksCache:
+    """Get cached JWKS cache for the Supabase project."""
+    settings = load_settings()
+    url = f"{settings.supabase_url.rstrip('/')}/auth/v1/.well-known/jwks.json"
+    return JwksCache(url, settings.jwks_refresh_seconds)
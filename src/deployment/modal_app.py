@@ -11,11 +11,11 @@ image = (
         "supabase",
         "pyjwt[crypto]",
         "cryptography",
-        "sqlalchemy[asyncio]",
         "asyncpg",
         "pydantic",
         "pydantic-settings",
         "httpx",
+        "orjson",
         "python-dotenv",
     )
     .add_local_python_source("src")
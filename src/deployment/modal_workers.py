@@ -16,11 +16,11 @@ image = (
     "supabase",
     "pyjwt[crypto]",
     "cryptography",
-    "sqlalchemy[asyncio]",
     "asyncpg",
     "pydantic",
     "pydantic-settings",
     "httpx",
+    "orjson",
     "python-dotenv",
     )
     .add_local_python_source("src")
@@ -98,30 +98,89 @@ async def process_api_job(job_id: str, job_type: str, user_id: str, job_paramete
     schedule=modal.Period(minutes=15),
     secrets=_secrets,
 )
-async def recover_orphaned_jobs() -> None:
-    """Scheduled recovery: mark stuck and orphaned jobs as failed."""
-    from src.services.job_queue import database
-
-    stuck = await database.find_stuck_jobs()
-    orphaned = await database.find_orphaned_jobs()
-
-    for job in stuck:
-        await database.mark_job_failed(
-            str(job["id"]),
-            "Job exceeded maximum processing time",
-            "JobTimeoutError",
-        )
-    for job in orphaned:
-        await database.mark_job_failed(
-            str(job["id"]),
-            "Job never started (pending timeout)",
-            "PendingTimeoutError",
-        )
+async def recover_orphaned_jobs() -> dict[str, int]:
+    """Scheduled recovery: re-queue or fail stuck and orphaned jobs.
+
+    Works in chunks and is safe to run concurrently.
+    """
+    from src.config.database import set_pool_role
+    from src.services.job_queue.service import JobQueueService
+    from src.utils.logging import get_logger
+
+    set_pool_role("worker")
+    # Leave headroom under the 300s function timeout.
+    counts = await JobQueueService().recover_jobs(max_seconds=240)
+    get_logger(__name__).info(
+        f"recovery sweep stuck={counts['stuck']} orphaned={counts['orphaned']} "
+        f"retried={counts['retried']}"
+    )
+    return counts
+
+
+@app.function(
+    image=image,
+    timeout=600,
+    schedule=modal.Period(days=1),
+    secrets=_secrets,
+)
+async def maintain_job_storage() -> dict[str, int]:
+    """Scheduled daily: create upcoming jobs partitions and retire expired ones.
+
+    Also purges old PGMQ archives and, in spawn mode, stale lane messages.
+    """
+    from src.config.database import set_pool_role
+    from src.services.job_queue.partitions import maintain_job_storage as run_maintenance
+
+    set_pool_role("worker")
+    return await run_maintenance()
+
+
+@app.function(
+    image=image,
+    timeout=900,  # 15 min
+    schedule=modal.Period(minutes=15),
+    secrets=_secrets,
+)
+async def consume_job_queue() -> None:
+    """Pull-based consumer: drain the job queue lanes for one schedule period.
+
+    Only runs with JOB_DISPATCH_MODE=consumer.
+    """
+    from src.config.database import set_pool_role
+    from src.models.config import load_settings
+    from src.services.job_queue.consumer import run_consumer
+
+    if load_settings().job_dispatch_mode != "consumer":
+        return
+    set_pool_role("worker")
+    # Stop reading before the next run starts; leave headroom to drain in-flight jobs.
+    await run_consumer(max_seconds=14 * 60 - 60)
+
+
+@app.function(
+    image=image,
+    timeout=120,
+    schedule=modal.Period(minutes=1),
+    secrets=_secrets,
+)
+async def dispatch_job_retries() -> None:
+    """Spawn due retries from the retry queue (JOB_DISPATCH_MODE=spawn only)."""
+    from src.config.database import set_pool_role
+    from src.models.config import load_settings
+    from src.services.job_queue.consumer import run_retry_dispatcher
+
+    if load_settings().job_dispatch_mode != "spawn":
+        return
+    set_pool_role("worker")
+    # Stop before the next run starts.
+    await run_retry_dispatcher(max_seconds=50)
 
 
 async def _process_job(job_id: str, job_type: str, user_id: str, job_parameters: dict) -> None:
     """Shared job processing logic."""
+    from src.config.database import set_pool_role
     from src.services.job_queue.service import JobQueueService
 
+    set_pool_role("worker")
     svc = JobQueueService()
     await svc.process_job(job_id, job_type, user_id, job_parameters)
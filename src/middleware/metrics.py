@@ -1,26 +1,51 @@
-"""Metrics middleware - request timing."""
+"""Metrics middleware - request timing log and Prometheus request metrics (pure ASGI)."""
 import time
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.utils.logging import get_logger
+from src.utils.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS
 
 logger = get_logger(__name__)
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    """Log request timing."""
+class MetricsMiddleware:
+    """Log request timing and record request count/latency per route template and status.
+
+    Duration covers the full (possibly streamed) response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next) -> Response:
         start = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = (time.perf_counter() - start) * 1000
-        request_id = getattr(request.state, "request_id", None)
-        extra = {"request_id": request_id} if request_id else {}
-        logger.info(
-            f"request completed path={request.url.path} method={request.method} status={response.status_code} duration_ms={duration_ms:.2f}",
-            extra=extra,
-        )
-        return response
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            duration_ms = duration * 1000
+            # Route template (e.g. /jobs/{job_id}) keeps label cardinality bounded.
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            labels = (scope["method"], route, str(status_code))
+            HTTP_REQUESTS.inc(*labels)
+            HTTP_REQUEST_DURATION.observe(duration, *labels)
+            request_id = scope.get("state", {}).get("request_id")
+            extra = {"request_id": request_id} if request_id else {}
+            logger.info(
+                f"request completed path={scope['path']} method={scope['method']} "
+                f"status={status_code} duration_ms={duration_ms:.2f}",
+                extra=extra,
+            )
@@ -22,11 +22,104 @@ class Settings(BaseSettings):
     supabase_url: str = Field(..., validation_alias="SUPABASE_URL")
     supabase_publishable_key: str = Field(..., validation_alias="SUPABASE_PUBLISHABLE_KEY")
     supabase_secret_key: str = Field(..., validation_alias="SUPABASE_SECRET_KEY")
+    jwks_refresh_seconds: int = Field(default=600, validation_alias="JWKS_REFRESH_SECONDS")
+    jwt_cache_max_size: int = Field(default=10000, validation_alias="JWT_CACHE_MAX_SIZE")
     transaction_pooler_url: str = Field(..., validation_alias="TRANSACTION_POOLER_URL")
+    # Session-mode pooler or direct URL, for connections that need a session (LISTEN, worker pools).
+    session_pooler_url: str | None = Field(default=None, validation_alias="SESSION_POOLER_URL")
+    # auto: API uses the transaction pooler (no prepared statements);
+    # workers use SESSION_POOLER_URL if set
+    db_connection_mode: Literal["auto", "transaction", "session"] = Field(
+        default="auto",
+        validation_alias="DB_CONNECTION_MODE",
+    )
+    # Prepared statement cache per connection (session mode only)
+    db_statement_cache_size: int = Field(default=100, validation_alias="DB_STATEMENT_CACHE_SIZE")
+    db_pool_min_size: int = Field(default=1, validation_alias="DB_POOL_MIN_SIZE")
+    db_pool_max_size: int = Field(default=10, validation_alias="DB_POOL_MAX_SIZE")
+    db_command_timeout: float = Field(default=60, validation_alias="DB_COMMAND_TIMEOUT")
+    slow_query_ms: float = Field(default=200, validation_alias="SLOW_QUERY_MS")
+    # Recent samples kept per statement for the percentile stats
+    query_stats_window: int = Field(default=1000, validation_alias="QUERY_STATS_WINDOW")
+    # Shared secret (X-Admin-Token) for /admin and /metrics; unset = both disabled
+    admin_token: str | None = Field(default=None, validation_alias="ADMIN_TOKEN")
+    # Read-through cache for completed/failed jobs in get_job (0 disables)
+    job_cache_max_size: int = Field(default=10000, validation_alias="JOB_CACHE_MAX_SIZE")
+    job_cache_ttl_seconds: float = Field(default=300, validation_alias="JOB_CACHE_TTL_SECONDS")
+    # Pending jobs with no queue message that are not picked up within this are orphaned
+    # (processing jobs: see the heartbeat timeout)
     job_stuck_timeout_minutes: int = Field(
         default=15,
         validation_alias="JOB_STUCK_TIMEOUT_MINUTES",
     )
+    # Processing jobs are refreshed every interval (one batched UPDATE per process) and count
+    # as stuck once their heartbeat is older than the timeout
+    job_heartbeat_interval_seconds: float = Field(
+        default=30,
+        validation_alias="JOB_HEARTBEAT_INTERVAL_SECONDS",
+    )
+    job_heartbeat_timeout_seconds: float = Field(
+        default=120,
+        validation_alias="JOB_HEARTBEAT_TIMEOUT_SECONDS",
+    )
+    recovery_batch_size: int = Field(default=500, validation_alias="RECOVERY_BATCH_SIZE")
+    # Recovery only scans partitions created within this window;
+    # older unfinished jobs are left alone
+    recovery_window_days: int = Field(default=7, validation_alias="RECOVERY_WINDOW_DAYS")
+    job_partition_months_ahead: int = Field(
+        default=3,
+        validation_alias="JOB_PARTITION_MONTHS_AHEAD",
+    )
+    job_retention_days: int = Field(default=180, validation_alias="JOB_RETENTION_DAYS")
+    # "archive": copy compact columns to jobs_archive before dropping a partition; "drop": discard
+    job_retention_mode: Literal["archive", "drop"] = Field(
+        default="archive",
+        validation_alias="JOB_RETENTION_MODE",
+    )
+    queue_archive_retention_days: int = Field(
+        default=14,
+        validation_alias="QUEUE_ARCHIVE_RETENTION_DAYS",
+    )
+    # "spawn": one Modal call per job; "consumer": workers pull from PGMQ (run_consumer)
+    job_dispatch_mode: Literal["spawn", "consumer"] = Field(
+        default="spawn",
+        validation_alias="JOB_DISPATCH_MODE",
+    )
+    # Where spawned jobs run: modal | asyncio (API event loop) | process (local process pool)
+    execution_backend: Literal["modal", "asyncio", "process"] = Field(
+        default="modal",
+        validation_alias="EXECUTION_BACKEND",
+    )
+    # Concurrent jobs per process for the asyncio and process backends
+    local_max_concurrency: int = Field(default=10, validation_alias="LOCAL_MAX_CONCURRENCY")
+    execution_shutdown_timeout: float = Field(
+        default=30,  # seconds
+        validation_alias="EXECUTION_SHUTDOWN_TIMEOUT",
+    )
+    consumer_batch_size: int = Field(default=10, validation_alias="CONSUMER_BATCH_SIZE")
+    consumer_concurrency: int = Field(default=10, validation_alias="CONSUMER_CONCURRENCY")
+    consumer_visibility_timeout: int = Field(
+        default=300,  # seconds
+        validation_alias="CONSUMER_VISIBILITY_TIMEOUT",
+    )
+    consumer_poll_interval: float = Field(
+        default=1.0,  # seconds
+        validation_alias="CONSUMER_POLL_INTERVAL",
+    )
+    consumer_archive_messages: bool = Field(
+        default=False,
+        validation_alias="CONSUMER_ARCHIVE_MESSAGES",
+    )
+    # Comma-separated tiers this consumer drains (e.g. "gpu"); empty = every tier
+    consumer_tiers: str = Field(default="", validation_alias="CONSUMER_TIERS")
+    # Max processing jobs per user across consumers; further messages are deferred (unset = no cap)
+    user_max_in_flight: int | None = Field(default=None, validation_alias="USER_MAX_IN_FLIGHT")
+    # Re-check delay for a message deferred by the per-user cap
+    user_defer_seconds: int = Field(default=5, validation_alias="USER_DEFER_SECONDS")
+    # JSON payloads (job_parameters, results) above this many bytes go to Supabase Storage
+    # (0 disables)
+    payload_offload_bytes: int = Field(default=64 * 1024, validation_alias="PAYLOAD_OFFLOAD_BYTES")
+    payload_bucket: str = Field(default="job-payloads", validation_alias="PAYLOAD_BUCKET")
     modal_app_name: str = Field(default="API-develop", validation_alias="MODAL_APP_NAME")
     modal_project: str | None = Field(default=None, validation_alias="MODAL_PROJECT")  # e.g. cody-99083
     log_level: str = Field(default="INFO", validation_alias="LOG_LEVEL")
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from src.models.jobs.job_definition import JobPriority
 from src.models.jobs.job_status import JobType
 
 
@@ -12,6 +13,21 @@ class JobCreateRequest(BaseModel):
 
     job_type: str = Field(..., description="Job type (e.g. sample_task)")
     job_parameters: dict = Field(default_factory=dict, description="Job parameters")
+    priority: JobPriority | None = Field(
+        default=None,
+        description='Queue lane: "interactive" or "bulk" (backfills); defaults per job type',
+    )
+
+
+MAX_BATCH_SIZE = 1000
+
+
+class JobBatchCreateRequest(BaseModel):
+    """Request to create many jobs at once."""
+
+    jobs: list[JobCreateRequest] = Field(
+        ..., min_length=1, max_length=MAX_BATCH_SIZE, description="Jobs to create"
+    )
 
 
 class JobResponse(BaseModel):
@@ -20,6 +36,7 @@ class JobResponse(BaseModel):
     id: UUID
     job_type: str
     status: str
+    priority: str = "interactive"
     user_id: UUID
     job_parameters: dict | None
     retry_count: int
@@ -32,8 +49,83 @@ class JobResponse(BaseModel):
     data_references: dict | None
 
 
+# Columns a job read can select (fields=); JobResponse is the "full" view.
+JOB_FIELDS: tuple[str, ...] = tuple(JobResponse.model_fields)
+# Default for listings: enough for a dashboard, none of the JSONB columns.
+JOB_SUMMARY_FIELDS: tuple[str, ...] = (
+    "id",
+    "job_type",
+    "status",
+    "priority",
+    "retry_count",
+    "created_at",
+    "updated_at",
+    "started_at",
+    "completed_at",
+)
+
+
+def parse_job_fields(fields: str | None, default: str) -> tuple[str, ...]:
+    """Columns for a fields= value: "summary", "full", or a comma-separated list.
+
+    id is always included. default ("summary" or "full") applies when fields is empty.
+    Raises ValueError for unknown fields.
+    """
+    fields = (fields or default).strip()
+    if fields == "full":
+        return JOB_FIELDS
+    if fields == "summary":
+        return JOB_SUMMARY_FIELDS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in JOB_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    # Keep JOB_FIELDS order so equal selections share one SQL statement (and prepared plan).
+    return tuple(f for f in JOB_FIELDS if f == "id" or f in requested)
+
+
+class JobFieldsResponse(BaseModel):
+    """A job with only the selected fields.
+
+    Routes serialize it with exclude_unset, so absent fields are omitted.
+    """
+
+    id: UUID
+    job_type: str | None = None
+    status: str | None = None
+    priority: str | None = None
+    user_id: UUID | None = None
+    job_parameters: dict | None = None
+    retry_count: int | None = None
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+    started_at: datetime | None = None
+    completed_at: datetime | None = None
+    error_message: str | None = None
+    error_type: str | None = None
+    data_references: dict | None = None
+
+
 class JobListResponse(BaseModel):
-    """Paginated job list response."""
+    """Paginated job list response; pass next_cursor back as cursor for the next page."""
+
+    items: list[JobFieldsResponse]
+    total: int | None = None
+    next_cursor: str | None = None
+
+
+class JobBatchItemResult(BaseModel):
+    """Per-item outcome of a batch create; job is set when the row was created."""
+
+    index: int
+    success: bool
+    job: JobResponse | None = None
+    error: str | None = None
+
+
+class JobBatchCreateResponse(BaseModel):
+    """Batch create response."""
 
-    items: list[JobResponse]
-    total: int
+    items: list[JobBatchItemResult]
+    succeeded: int
+    failed: int
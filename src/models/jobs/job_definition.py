@@ -0,0 +1,53 @@
+"""Job type definitions: handler, execution tier and policies."""
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict, Field
+
+# Execution tiers; each maps to a Modal function in src/deployment/modal_workers.py.
+JobTier = Literal["sample", "gpu", "browser", "llm", "api"]
+# Queue lanes per tier; consumers read interactive lanes ahead of bulk (see queue.PRIORITY_WEIGHTS).
+JobPriority = Literal["interactive", "bulk"]
+
+
+class RetryPolicy(BaseModel):
+    """How often and how fast a failed job is re-run."""
+
+    model_config = ConfigDict(frozen=True)
+
+    max_attempts: int = Field(
+        default=3, ge=1, description="Total runs including the first; 1 = no retry"
+    )
+    backoff_seconds: float = Field(default=5.0, ge=0, description="Delay before the first retry")
+    max_backoff_seconds: float = Field(
+        default=60.0, ge=0, description="Cap on the exponential delay"
+    )
+
+
+class JobDefinition(BaseModel):
+    """Everything the queue needs to validate, route and run one job type."""
+
+    model_config = ConfigDict(frozen=True)
+
+    job_type: str
+    handler: str = Field(
+        ..., description='"module:function", imported on first run (worker side only)'
+    )
+    validator: str | None = Field(
+        default=None, description='Optional "module:function" raising ValueError on bad parameters'
+    )
+    tier: JobTier = "sample"
+    priority: JobPriority = Field(
+        default="interactive", description="Lane used when a request does not set one"
+    )
+    timeout_seconds: float = Field(
+        default=240, gt=0, description="Handler time limit; below the tier's Modal timeout"
+    )
+    resolve_payloads: bool = Field(
+        default=True,
+        description="Download offloaded job_parameters before the handler runs; False passes the "
+        "reference through for handlers that stream it (payloads.stream)",
+    )
+    max_concurrency: int | None = Field(
+        default=None, ge=1, description="In-flight runs per worker process"
+    )
+    retry: RetryPolicy = RetryPolicy()
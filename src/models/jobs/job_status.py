@@ -11,6 +11,10 @@ class JobStatus(str, Enum):
     FAILED = "failed"
 
 
+# Statuses a job never leaves.
+TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED.value, JobStatus.FAILED.value})
+
+
 class JobType(str, Enum):
     """Job type values."""
 
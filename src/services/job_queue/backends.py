@@ -0,0 +1,234 @@
+"""Execution backends: where spawned jobs run (Modal, in-process asyncio, local process pool)."""
+import abc
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import modal
+
+from src.models.config import load_settings
+from src.utils.logging import get_logger
+
+from .registry import get_tier_function
+
+logger = get_logger(__name__)
+
+# A job to run: {"job_id", "job_type", "user_id", "job_parameters"}.
+Job = dict
+
+
+class ExecutionBackend(abc.ABC):
+    """Dispatches jobs for execution.
+
+    submit returns once the job is handed off, not when it finishes.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    async def submit(self, job: Job) -> None:
+        """Hand off one job; raises if it could not be dispatched."""
+
+    async def submit_many(self, jobs: list[Job]) -> dict[str, str]:
+        """Hand off many jobs. Returns {job_id: error} for jobs not dispatched."""
+        errors: dict[str, str] = {}
+        for job in jobs:
+            try:
+                await self.submit(job)
+            except Exception as e:
+                errors[job["job_id"]] = str(e)
+        return errors
+
+    async def shutdown(self, timeout: float) -> None:
+        """Stop accepting jobs and let in-flight ones finish for up to timeout seconds."""
+
+
+class ModalBackend(ExecutionBackend):
+    """One Modal function call per job, routed by tier. Never blocks the event loop."""
+
+    name = "modal"
+
+    def __init__(self, app_name: str) -> None:
+        self._app_name = app_name
+        # (app_name, func_name) -> hydrated handle; resolved once instead of per job.
+        self._functions: dict[tuple[str, str], modal.Function] = {}
+        self._lock: asyncio.Lock | None = None
+
+    async def _function(self, func_name: str) -> modal.Function:
+        key = (self._app_name, func_name)
+        func = self._functions.get(key)
+        if func is not None:
+            return func
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            func = self._functions.get(key)
+            if func is None:
+                func = modal.Function.from_name(self._app_name, func_name)
+                await func.hydrate.aio()
+                self._functions[key] = func
+        return func
+
+    def _forget(self, func_name: str) -> None:
+        """Drop a handle after a failed call so the next one re-resolves it.
+
+        Covers e.g. a redeploy that replaced the function.
+        """
+        self._functions.pop((self._app_name, func_name), None)
+
+    async def submit(self, job: Job) -> None:
+        func_name = get_tier_function(job["job_type"])
+        try:
+            func = await self._function(func_name)
+            await func.spawn.aio(
+                job["job_id"], job["job_type"], job["user_id"], job["job_parameters"]
+            )
+        except Exception as e:
+            self._forget(func_name)
+            raise RuntimeError(f"Failed to spawn job: {e}") from e
+
+    async def submit_many(self, jobs: list[Job]) -> dict[str, str]:
+        """One spawn_map per Modal function, all functions concurrently."""
+        by_func: dict[str, list[Job]] = {}
+        errors: dict[str, str] = {}
+        for job in jobs:
+            try:
+                func_name = get_tier_function(job["job_type"])
+            except ValueError as e:
+                errors[job["job_id"]] = str(e)
+                continue
+            by_func.setdefault(func_name, []).append(job)
+
+        async def spawn_group(func_name: str, group: list[Job]) -> None:
+            try:
+                func = await self._function(func_name)
+                await func.spawn_map.aio(
+                    [j["job_id"] for j in group],
+                    [j["job_type"] for j in group],
+                    [j["user_id"] for j in group],
+                    [j["job_parameters"] for j in group],
+                )
+            except Exception as e:
+                self._forget(func_name)
+                for j in group:
+                    errors[j["job_id"]] = f"Failed to spawn job: {e}"
+
+        await asyncio.gather(*(spawn_group(name, group) for name, group in by_func.items()))
+        return errors
+
+
+class _LocalBackend(ExecutionBackend):
+    """Runs jobs as tasks of this process, at most max_concurrency at a time."""
+
+    def __init__(self, max_concurrency: int) -> None:
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self._closing = False
+
+    async def submit(self, job: Job) -> None:
+        if self._closing:
+            raise RuntimeError("Execution backend is shutting down")
+        get_tier_function(job["job_type"])  # reject unknown types at dispatch, like Modal
+        task = asyncio.create_task(self._run_bounded(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_bounded(self, job: Job) -> None:
+        async with self._slots:
+            try:
+                await self._run(job)
+            except Exception as e:
+                logger.error(f"local job execution failed job_id={job['job_id']} error={e}")
+
+    @abc.abstractmethod
+    async def _run(self, job: Job) -> None:
+        """Run one job to completion in this backend's executor."""
+
+    async def shutdown(self, timeout: float) -> None:
+        self._closing = True
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        if pending:
+            # Cancelled jobs stay pending/processing; the recovery sweep fails them.
+            logger.warning(f"execution backend shutdown cancelling {len(pending)} jobs")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+class AsyncioBackend(_LocalBackend):
+    """Jobs run on the API event loop; millisecond dispatch for I/O-bound and micro jobs."""
+
+    name = "asyncio"
+
+    async def _run(self, job: Job) -> None:
+        from .service import JobQueueService
+
+        await JobQueueService().process_job(
+            job["job_id"], job["job_type"], job["user_id"], job["job_parameters"]
+        )
+
+
+# Child-process state for ProcessPoolBackend: one event loop (and DB pool) per worker process.
+_child_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _init_child() -> None:
+    global _child_loop
+    from src.config.database import set_pool_role
+
+    set_pool_role("worker")
+    _child_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_child_loop)
+
+
+def _run_in_child(job: Job) -> None:
+    from .service import JobQueueService
+
+    _child_loop.run_until_complete(
+        JobQueueService().process_job(
+            job["job_id"], job["job_type"], job["user_id"], job["job_parameters"]
+        )
+    )
+
+
+class ProcessPoolBackend(_LocalBackend):
+    """Jobs run in a local pool of worker processes, for CPU-bound handlers."""
+
+    name = "process"
+
+    def __init__(self, max_workers: int) -> None:
+        super().__init__(max_workers)
+        # spawn, not fork: the parent has a running loop and open DB connections.
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_child,
+        )
+
+    async def _run(self, job: Job) -> None:
+        await asyncio.get_running_loop().run_in_executor(self._executor, _run_in_child, job)
+
+    async def shutdown(self, timeout: float) -> None:
+        await super().shutdown(timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache
+def get_execution_backend() -> ExecutionBackend:
+    """Get process-wide execution backend (EXECUTION_BACKEND)."""
+    settings = load_settings()
+    if settings.execution_backend == "asyncio":
+        return AsyncioBackend(settings.local_max_concurrency)
+    if settings.execution_backend == "process":
+        return ProcessPoolBackend(settings.local_max_concurrency)
+    return ModalBackend(f"Job-Worker-{settings.environment}")
+
+
+async def shutdown_execution_backend() -> None:
+    """Drain the backend if one was created (API lifespan shutdown)."""
+    if get_execution_backend.cache_info().currsize:
+        await get_execution_backend().shutdown(load_settings().execution_shutdown_timeout)
+        get_execution_backend.cache_clear()
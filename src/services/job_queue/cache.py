@@ -0,0 +1,62 @@
+"""Process-local read-through cache for terminal-state jobs."""
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any
+
+from src.models.config import load_settings
+from src.models.jobs.job_status import TERMINAL_STATUSES
+from src.utils.metrics import JOB_CACHE_REQUESTS
+
+
+class TerminalJobCache:
+    """Bounded LRU with TTL: (job_id, user_id) -> job dict. Only completed/failed jobs are stored,
+    since their rows no longer change; anything still in flight always goes to the database."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl_seconds
+        self._items: OrderedDict[tuple[str, str], tuple[dict[str, Any], float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, job_id: str, user_id: str) -> dict[str, Any] | None:
+        """Cached job, or None (counted as a miss) when absent or expired."""
+        key = (job_id, user_id)
+        item = self._items.get(key)
+        if item is not None and item[1] <= time.monotonic():
+            del self._items[key]
+            item = None
+        if item is None:
+            self.misses += 1
+            JOB_CACHE_REQUESTS.inc("miss")
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        JOB_CACHE_REQUESTS.inc("hit")
+        return item[0]
+
+    def put(self, job_id: str, user_id: str, job: dict[str, Any]) -> None:
+        """Remember job if it is terminal; no-op otherwise."""
+        if self._max_size <= 0 or job.get("status") not in TERMINAL_STATUSES:
+            return
+        key = (job_id, user_id)
+        self._items[key] = (job, time.monotonic() + self._ttl)
+        self._items.move_to_end(key)
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._items),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+@lru_cache
+def get_terminal_job_cache() -> TerminalJobCache:
+    """Get process-wide terminal job cache."""
+    settings = load_settings()
+    return TerminalJobCache(settings.job_cache_max_size, settings.job_cache_ttl_seconds)
@@ -0,0 +1,207 @@
+"""PGMQ consumer: long-lived pull loop that drains the job queue lanes with weighted fair share."""
+import asyncio
+import time
+
+from src.models.config import load_settings
+from src.utils.logging import get_logger
+
+from . import queue
+from . import spawner
+from .registry import TIER_FUNCTIONS
+from .service import JobQueueService
+
+logger = get_logger(__name__)
+
+
+def consumer_lanes(tiers: str = "") -> dict[str, int]:
+    """{queue: weight} for the lanes this consumer drains.
+
+    tiers is comma-separated; empty means all tiers. The legacy job_queue is drained at bulk
+    weight until it empties.
+    """
+    selected = [t.strip() for t in tiers.split(",") if t.strip()] or list(TIER_FUNCTIONS)
+    unknown = set(selected) - set(TIER_FUNCTIONS)
+    if unknown:
+        raise ValueError(f"Unknown consumer tiers: {', '.join(sorted(unknown))}")
+    lanes = {
+        queue.queue_name(tier, priority): queue.PRIORITY_WEIGHTS[priority]
+        for tier in selected
+        for priority in queue.PRIORITIES
+    }
+    lanes[queue.LEGACY_QUEUE_NAME] = queue.PRIORITY_WEIGHTS["bulk"]
+    return lanes
+
+
+class WeightedLanes:
+    """Smooth weighted round-robin over queues: with weights 4:1 a busy interactive lane gets four
+    reads for every bulk read, and an empty lane's turns go to the others."""
+
+    def __init__(self, weights: dict[str, int]) -> None:
+        self._weights = weights
+        self._current = dict.fromkeys(weights, 0)
+
+    def order(self) -> list[str]:
+        """Queues to try this round: the scheduled lane first, then the rest by remaining credit."""
+        total = sum(self._weights.values())
+        for name, weight in self._weights.items():
+            self._current[name] += weight
+        ranked = sorted(self._current, key=self._current.__getitem__, reverse=True)
+        self._current[ranked[0]] -= total
+        return ranked
+
+
+async def _handle_message(
+    service: JobQueueService,
+    lane: str,
+    message: dict,
+    archive: bool,
+    max_user_in_flight: int | None,
+    defer: int,
+) -> None:
+    """Process one message; ack (delete/archive) only after process_job returns."""
+    msg_id = message["msg_id"]
+    body = message["message"]
+    try:
+        processed = await service.process_job(
+            body["job_id"],
+            body["job_type"],
+            body["user_id"],
+            body.get("job_parameters") or {},
+            max_user_in_flight=max_user_in_flight,
+        )
+        if not processed:
+            # User at their in-flight cap: leave the job pending and let other users'
+            # messages through.
+            await queue.defer_job_message(lane, msg_id, defer)
+            return
+    except Exception as e:
+        # Not acked: the message becomes visible again after its visibility timeout.
+        logger.error(
+            f"consumer failed queue={lane} msg_id={msg_id} job_id={body.get('job_id')} error={e}"
+        )
+        return
+    if archive:
+        await queue.archive_job_message(lane, msg_id)
+    else:
+        await queue.delete_job_message(lane, msg_id)
+
+
+async def run_consumer(stop: asyncio.Event | None = None, max_seconds: float | None = None) -> int:
+    """Read the lane queues in batches and process messages under a concurrency limit.
+
+    Each read goes to the next lane in weighted round-robin order, falling through to the other
+    lanes when it is empty, so bulk backfills cannot starve interactive jobs but still use idle
+    capacity.
+    Runs until stop is set or max_seconds elapses, then waits for in-flight jobs.
+    Returns the number of messages handled.
+    """
+    settings = load_settings()
+    concurrency = settings.consumer_concurrency
+    stop = stop or asyncio.Event()
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    service = JobQueueService()
+    lanes = WeightedLanes(consumer_lanes(settings.consumer_tiers))
+    in_flight: set[asyncio.Task] = set()
+    handled = 0
+
+    logger.info(
+        f"consumer started concurrency={concurrency} batch_size={settings.consumer_batch_size} "
+        f"vt={settings.consumer_visibility_timeout} tiers={settings.consumer_tiers or 'all'} "
+        f"user_max_in_flight={settings.user_max_in_flight}"
+    )
+    while not stop.is_set() and (deadline is None or time.monotonic() < deadline):
+        free = concurrency - len(in_flight)
+        if free <= 0:
+            # Backpressure: only read more once a slot frees up.
+            await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            continue
+
+        lane, messages = None, []
+        for lane in lanes.order():
+            try:
+                messages = await queue.read_job_messages(
+                    lane,
+                    qty=min(settings.consumer_batch_size, free),
+                    vt=settings.consumer_visibility_timeout,
+                )
+            except Exception as e:
+                logger.error(f"consumer read failed queue={lane} error={e}")
+                messages = []
+            if messages:
+                break
+
+        if not messages:
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=settings.consumer_poll_interval)
+            except TimeoutError:
+                pass
+            continue
+
+        for message in messages:
+            task = asyncio.create_task(
+                _handle_message(
+                    service,
+                    lane,
+                    message,
+                    settings.consumer_archive_messages,
+                    settings.user_max_in_flight,
+                    settings.user_defer_seconds,
+                )
+            )
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        handled += len(messages)
+
+    if in_flight:
+        await asyncio.gather(*in_flight, return_exceptions=True)
+    logger.info(f"consumer stopped handled={handled}")
+    return handled
+
+
+async def run_retry_dispatcher(
+    stop: asyncio.Event | None = None, max_seconds: float | None = None
+) -> int:
+    """Spawn mode: re-dispatch retries from the retry queue once their backoff delay has elapsed.
+
+    retry_job sends spawn-mode retries to RETRY_QUEUE_NAME with the delay as the message's
+    visibility delay, so no worker sleeps through a backoff. Messages are deleted once their
+    job is spawned; failed spawns become visible again after the visibility timeout. Runs
+    until stop is set or max_seconds elapses. Returns jobs dispatched.
+    """
+    settings = load_settings()
+    stop = stop or asyncio.Event()
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    dispatched = 0
+
+    while not stop.is_set() and (deadline is None or time.monotonic() < deadline):
+        try:
+            messages = await queue.read_job_messages(
+                queue.RETRY_QUEUE_NAME,
+                qty=settings.consumer_batch_size,
+                vt=settings.consumer_visibility_timeout,
+            )
+            if messages:
+                jobs = [
+                    {
+                        "job_id": m["message"]["job_id"],
+                        "job_type": m["message"]["job_type"],
+                        "user_id": m["message"]["user_id"],
+                        "job_parameters": m["message"].get("job_parameters") or {},
+                    }
+                    for m in messages
+                ]
+                errors = await spawner.spawn_jobs(jobs)
+                for message in messages:
+                    if message["message"]["job_id"] not in errors:
+                        await queue.delete_job_message(queue.RETRY_QUEUE_NAME, message["msg_id"])
+                dispatched += len(messages) - len(errors)
+                if errors:
+                    logger.error(f"retry dispatch failed count={len(errors)} errors={errors}")
+                continue
+        except Exception as e:
+            logger.error(f"retry dispatcher failed error={e}")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=settings.consumer_poll_interval)
+        except TimeoutError:
+            pass
+    return dispatched
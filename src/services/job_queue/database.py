@@ -1,150 +1,359 @@
 """Job database operations (asyncpg)."""
-import asyncpg
-from uuid import UUID
+import base64
 from datetime import datetime
 from typing import Any
+from uuid import UUID, uuid4
 
+from src.config.database import get_pool
 from src.models.config import load_settings
+from src.models.jobs.job import JOB_FIELDS
 from src.models.jobs.job_status import JobStatus
+from src.services.job_queue.queue import QUEUE_NAME_SQL, all_queue_names, route_job
+from src.utils.metrics import observe_db
 
-
-async def get_pool() -> asyncpg.Pool:
-    """Get asyncpg connection pool."""
-    url = load_settings().transaction_pooler_url
-    return await asyncpg.create_pool(url, min_size=1, max_size=5, command_timeout=60)
+# NOTIFY channel for status changes; payload is {"id", "user_id", "status"} JSON.
+JOB_STATUS_CHANNEL = "job_status"
 
 
+@observe_db
 async def create_job(
     job_type: str,
     user_id: str,
     job_parameters: dict,
+    priority: str = "interactive",
+    enqueue: bool = True,
 ) -> dict[str, Any]:
-    """Create a job and return it."""
-    url = load_settings().transaction_pooler_url
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
+    """Create a job and enqueue its PGMQ message on its lane in one statement.
+
+    There is never a row without a message.
+
+    enqueue=False (spawn mode: nothing reads the lanes) inserts the row only.
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            WITH job AS (
+                INSERT INTO public.jobs
+                    (job_type, status, user_id, job_parameters, priority, retry_count)
+                VALUES ($1, $2, $3, $4, $6, 0)
+                RETURNING id, job_type, status, priority, user_id, job_parameters, retry_count,
+                    created_at, updated_at, started_at, completed_at, error_message, error_type,
+                    data_references
+            ), msg AS (
+                SELECT pgmq.send($5, jsonb_build_object(
+                    'job_id', job.id, 'job_type', job.job_type,
+                    'user_id', job.user_id, 'job_parameters', job.job_parameters
+                )) AS msg_id
+                FROM job
+                WHERE $7
+            )
+            SELECT job.* FROM job
+            WHERE (SELECT count(*) FROM msg) >= 0  -- forces the msg CTE to run
+            """,
+            job_type,
+            JobStatus.PENDING.value,
+            user_id,
+            job_parameters,
+            route_job(job_type, priority),
+            priority,
+            enqueue,
+        )
+        return dict(row)
+
+
+@observe_db
+async def create_jobs(
+    user_id: str,
+    jobs: list[tuple[str, dict, str]],
+    enqueue: bool = True,
+) -> list[dict[str, Any]]:
+    """Create many jobs and their PGMQ messages in one statement.
+
+    Uses a multi-row INSERT plus one pgmq.send_batch per lane.
+
+    jobs is [(job_type, job_parameters, priority)]; output keeps input order.
+    enqueue=False inserts the rows only.
+    """
+    if not jobs:
+        return []
+    ids = [uuid4() for _ in jobs]
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            WITH created AS (
+                INSERT INTO public.jobs
+                    (id, job_type, status, user_id, job_parameters, priority, retry_count)
+                SELECT t.id, t.job_type, $1, $2, t.job_parameters, t.priority, 0
+                FROM unnest($3::uuid[], $4::text[], $5::jsonb[], $6::text[])
+                    AS t(id, job_type, job_parameters, priority)
+                RETURNING id, job_type, status, priority, user_id, job_parameters, retry_count,
+                    created_at, updated_at, started_at, completed_at, error_message, error_type,
+                    data_references
+            ), msgs AS (
+                SELECT pgmq.send_batch(lane.queue, array_agg(jsonb_build_object(
+                    'job_id', created.id, 'job_type', created.job_type,
+                    'user_id', created.user_id, 'job_parameters', created.job_parameters
+                ))) AS msg_id
+                FROM created
+                JOIN unnest($3::uuid[], $7::text[]) AS lane(id, queue) ON lane.id = created.id
+                WHERE $8
+                GROUP BY lane.queue
+            )
+            SELECT created.* FROM created
+            WHERE (SELECT count(*) FROM msgs) >= 0  -- forces the msgs CTE to run
+            """,
+            JobStatus.PENDING.value,
+            user_id,
+            ids,
+            [job_type for job_type, _, _ in jobs],
+            [job_parameters for _, job_parameters, _ in jobs],
+            [priority for _, _, priority in jobs],
+            [route_job(job_type, priority) for job_type, _, priority in jobs],
+            enqueue,
+        )
+    by_id = {r["id"]: dict(r) for r in rows}
+    return [by_id[i] for i in ids]
+
+
+# Lookups by id try partitions within RECOVERY_WINDOW_DAYS first (where nearly all hits land),
+# then the older ones on a miss, so a long-pending or long-running job is never silently skipped.
+_WINDOW_OPS = (">", "<=")
+
+
+def _select_list(columns: tuple[str, ...]) -> str:
+    """SQL select list for job columns; only whitelisted names are ever interpolated."""
+    unknown = set(columns) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown job columns: {', '.join(sorted(unknown))}")
+    return ", ".join(columns)
+
+
+@observe_db
+async def get_job_by_id(
+    job_id: str, user_id: str | None = None, columns: tuple[str, ...] = JOB_FIELDS
+) -> dict[str, Any] | None:
+    """Get job by ID, selecting only columns; optionally filter by user_id for user-scoped access.
+
+    The id alone probes every partition, so the partitions within RECOVERY_WINDOW_DAYS (where
+    nearly all reads land) are tried first and the rest only on a miss.
+    """
+    select = _select_list(columns)
+    query = f"SELECT {select} FROM public.jobs WHERE id = $1 AND ($2::uuid IS NULL OR user_id = $2)"
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        for op in _WINDOW_OPS:
             row = await conn.fetchrow(
-                """
-                INSERT INTO public.jobs (job_type, status, user_id, job_parameters, retry_count)
-                VALUES ($1, $2, $3, $4, 0)
-                RETURNING id, job_type, status, user_id, job_parameters, retry_count,
-                    created_at, updated_at, started_at, completed_at, error_message, error_type, data_references
-                """,
-                job_type,
-                JobStatus.PENDING.value,
+                f"{query} AND created_at {op} NOW() - INTERVAL '1 day' * $3",
+                job_id,
                 user_id,
-                asyncpg.Json(job_parameters),
+                load_settings().recovery_window_days,
             )
-            return dict(row)
-
-
-async def get_job_by_id(job_id: str, user_id: str | None = None) -> dict[str, Any] | None:
-    """Get job by ID; optionally filter by user_id for user-scoped access."""
-    url = load_settings().transaction_pooler_url
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            if user_id:
-                row = await conn.fetchrow(
-                    "SELECT * FROM public.jobs WHERE id = $1 AND user_id = $2",
-                    job_id,
-                    user_id,
-                )
-            else:
-                row = await conn.fetchrow("SELECT * FROM public.jobs WHERE id = $1", job_id)
-            return dict(row) if row else None
+            if row is not None:
+                return dict(row)
+        return None
 
 
-async def update_job_status(
+@observe_db
+async def transition_job(
     job_id: str,
     status: str,
-    started_at: datetime | None = None,
-    completed_at: datetime | None = None,
-) -> None:
-    """Update job status."""
-    url = load_settings().transaction_pooler_url
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            if started_at is not None and completed_at is not None:
-                await conn.execute(
-                    """
-                    UPDATE public.jobs SET status = $1, updated_at = NOW(), started_at = $2, completed_at = $3
-                    WHERE id = $4
-                    """,
-                    status,
-                    started_at,
-                    completed_at,
-                    job_id,
-                )
-            elif started_at is not None:
-                await conn.execute(
-                    """
-                    UPDATE public.jobs SET status = $1, updated_at = NOW(), started_at = $2
-                    WHERE id = $3
-                    """,
-                    status,
-                    started_at,
-                    job_id,
-                )
-            else:
-                await conn.execute(
-                    "UPDATE public.jobs SET status = $1, updated_at = NOW() WHERE id = $2",
-                    status,
-                    job_id,
-                )
+    from_statuses: tuple[str, ...] | None = None,
+    data_references: dict | None = None,
+    error_message: str | None = None,
+    error_type: str | None = None,
+    error_context: dict | None = None,
+) -> bool:
+    """Move a job to status in one UPDATE: timestamps, results and error fields together.
 
-
-async def store_error_info(job_id: str, error_message: str, error_type: str, error_context: dict | None = None) -> None:
-    """Store error info on job."""
-    url = load_settings().transaction_pooler_url
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                """
-                UPDATE public.jobs SET error_message = $1, error_type = $2, error_context = $3, updated_at = NOW()
-                WHERE id = $4
+    Only applies when the current status is in from_statuses (any status when None), so a
+    worker and a recovery sweep cannot overwrite each other. Recent partitions are tried first
+    (see _WINDOW_OPS). Emits NOTIFY on JOB_STATUS_CHANNEL (delivered at commit). Returns whether
+    the row changed.
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        for op in _WINDOW_OPS:
+            row = await conn.fetchrow(
+                f"""
+                UPDATE public.jobs SET
+                    status = $2,
+                    updated_at = NOW(),
+                    started_at = CASE WHEN $2 = 'processing' THEN NOW() ELSE started_at END,
+                    heartbeat_at = CASE WHEN $2 = 'processing' THEN NOW() ELSE heartbeat_at END,
+                    completed_at = CASE WHEN $2 IN ('completed', 'failed') THEN NOW()
+                        ELSE completed_at END,
+                    data_references = COALESCE($3, data_references),
+                    -- Completing clears errors left by earlier failed attempts
+                    error_message = CASE WHEN $2 = 'completed' THEN NULL
+                        ELSE COALESCE($4, error_message) END,
+                    error_type = CASE WHEN $2 = 'completed' THEN NULL
+                        ELSE COALESCE($5, error_type) END,
+                    error_context = CASE WHEN $2 = 'completed' THEN NULL
+                        ELSE COALESCE($6, error_context) END
+                WHERE id = $1 AND ($7::text[] IS NULL OR status = ANY($7::text[]))
+                    AND created_at {op} NOW() - INTERVAL '1 day' * $9
+                RETURNING id, pg_notify(
+                    $8, json_build_object('id', id, 'user_id', user_id, 'status', status)::text
+                )
                 """,
+                job_id,
+                status,
+                data_references,
                 error_message,
                 error_type,
-                asyncpg.Json(error_context or {}),
-                job_id,
+                error_context,
+                list(from_statuses) if from_statuses is not None else None,
+                JOB_STATUS_CHANNEL,
+                load_settings().recovery_window_days,
             )
+            if row is not None:
+                return True
+        return False
+
 
+async def start_job(job_id: str) -> bool:
+    """pending -> processing. False if the job was already claimed or finished."""
+    return await transition_job(job_id, JobStatus.PROCESSING.value, (JobStatus.PENDING.value,))
 
-async def store_data_references(job_id: str, data_references: dict) -> None:
-    """Store data references on job."""
-    url = load_settings().transaction_pooler_url
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE public.jobs SET data_references = $1, updated_at = NOW() WHERE id = $2",
-                asyncpg.Json(data_references),
+
+@observe_db
+async def claim_job(job_id: str, max_user_in_flight: int) -> str:
+    """pending -> processing unless the job's user already has max_user_in_flight jobs processing.
+
+    Returns "claimed", "busy" (still pending, user at cap) or "skipped" (not pending). The cap
+    is checked and applied in one statement, so concurrent claims for one user can briefly
+    overshoot it.
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        for op in _WINDOW_OPS:
+            row = await conn.fetchrow(
+                f"""
+                WITH target AS (
+                    SELECT id, created_at, user_id, status FROM public.jobs
+                    WHERE id = $1 AND created_at {op} NOW() - INTERVAL '1 day' * $6
+                ), claimed AS (
+                    UPDATE public.jobs j
+                    SET status = $2, updated_at = NOW(), started_at = NOW(), heartbeat_at = NOW()
+                    FROM target
+                    WHERE j.id = target.id AND j.created_at = target.created_at AND j.status = $3
+                        AND (
+                            SELECT count(*) FROM public.jobs p
+                            WHERE p.user_id = target.user_id AND p.status = $2
+                                AND p.created_at > NOW() - INTERVAL '1 day' * $6
+                        ) < $4
+                    RETURNING j.id, pg_notify(
+                        $5,
+                        json_build_object(
+                            'id', j.id, 'user_id', j.user_id, 'status', j.status
+                        )::text
+                    )
+                )
+                SELECT target.status, EXISTS (SELECT 1 FROM claimed) AS claimed FROM target
+                """,
                 job_id,
+                JobStatus.PROCESSING.value,
+                JobStatus.PENDING.value,
+                max_user_in_flight,
+                JOB_STATUS_CHANNEL,
+                load_settings().recovery_window_days,
             )
+            if row is not None:
+                break
+        if row is None or row["status"] != JobStatus.PENDING.value:
+            return "skipped"
+        return "claimed" if row["claimed"] else "busy"
+
+
+async def complete_job(job_id: str, data_references: dict) -> bool:
+    """processing -> completed with results; clears error fields from earlier attempts.
+
+    False if the job is no longer processing.
+    """
+    return await transition_job(
+        job_id,
+        JobStatus.COMPLETED.value,
+        (JobStatus.PROCESSING.value,),
+        data_references=data_references,
+    )
 
 
+@observe_db
+async def heartbeat_jobs(job_ids: list[str]) -> int:
+    """Set heartbeat_at = NOW() on the processing jobs among job_ids in one UPDATE.
+
+    Returns rows touched. Leaves updated_at alone: it still marks the last status transition.
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        result = await conn.execute(
+            """
+            UPDATE public.jobs SET heartbeat_at = NOW()
+            WHERE id = ANY($1::uuid[]) AND status = $2
+                AND created_at > NOW() - INTERVAL '1 day' * $3
+            """,
+            job_ids,
+            JobStatus.PROCESSING.value,
+            load_settings().recovery_window_days,
+        )
+        return int(result.split()[-1])
+
+
+def encode_cursor(created_at: datetime, job_id: UUID | str) -> str:
+    """Opaque keyset cursor for (created_at, id)."""
+    raw = f"{created_at.isoformat()}|{job_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a cursor from encode_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, job_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(job_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+@observe_db
 async def list_jobs(
     user_id: str,
     status: str | None = None,
     job_type: str | None = None,
     limit: int = 20,
     offset: int = 0,
-) -> tuple[list[dict[str, Any]], int]:
-    """List jobs for user (user-scoped). Returns (items, total)."""
-    url = load_settings().transaction_pooler_url
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            where = ["user_id = $1"]
-            params: list[Any] = [user_id]
-            n = 2
-            if status:
-                where.append(f"status = ${n}")
-                params.append(status)
-                n += 1
-            if job_type:
-                where.append(f"job_type = ${n}")
-                params.append(job_type)
-                n += 1
+    cursor: str | None = None,
+    include_total: bool = False,
+    columns: tuple[str, ...] = JOB_FIELDS,
+) -> tuple[list[dict[str, Any]], int | None, str | None]:
+    """List jobs for user (user-scoped), newest first, selecting only columns.
+
+    Returns (items, total, next_cursor).
 
+    Pages by keyset on (created_at, id) when cursor is given (offset is then ignored);
+    total is only counted when include_total is set.
+    """
+    after = decode_cursor(cursor) if cursor else None
+    # The cursor needs (created_at, id) even when they were not requested.
+    select = _select_list(tuple(dict.fromkeys((*columns, "id", "created_at"))))
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        where = ["user_id = $1"]
+        params: list[Any] = [user_id]
+        n = 2
+        if status:
+            where.append(f"status = ${n}")
+            params.append(status)
+            n += 1
+        if job_type:
+            where.append(f"job_type = ${n}")
+            params.append(job_type)
+            n += 1
+
+        total = None
+        if include_total:
             where_clause = " AND ".join(where)
             count_row = await conn.fetchrow(
                 f"SELECT COUNT(*)::int as c FROM public.jobs WHERE {where_clause}",
@@ -152,51 +361,268 @@ async def list_jobs(
             )
             total = count_row["c"] if count_row else 0
 
-            params.extend([limit, offset])
-            rows = await conn.fetch(
+        if after:
+            where.append(f"(created_at, id) < (${n}, ${n + 1})")
+            params.extend(after)
+            n += 2
+            offset = 0
+
+        where_clause = " AND ".join(where)
+        # One extra row tells us whether there is a next page.
+        params.extend([limit + 1, offset])
+        rows = await conn.fetch(
+            f"""
+            SELECT {select} FROM public.jobs WHERE {where_clause}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ${n} OFFSET ${n + 1}
+            """,
+            *params,
+        )
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(page[-1]["created_at"], page[-1]["id"])
+        items = [{c: r[c] for c in columns} for r in page]
+        return items, total, next_cursor
+
+
+# Retry delay in seconds for a job whose retry_count is about to be incremented: exponential in
+# retry_count, capped, with "equal jitter" (uniform in [d/2, d]) so retries of a burst spread out.
+_BACKOFF_SQL = "CEIL(LEAST({max}, {base} * POWER(2, {attempts})) * (0.5 + random() * 0.5))::int"
+
+
+@observe_db
+async def retry_job(
+    job_id: str,
+    tier: str,
+    max_attempts: int,
+    backoff_seconds: float,
+    max_backoff_seconds: float,
+    error_message: str,
+    error_type: str,
+    queue: str | None = None,
+) -> int | None:
+    """processing -> pending with retry_count + 1 and a delayed PGMQ message, in one statement.
+
+    The message goes to queue, or to the job's lane when None. Only applies while attempts remain
+    (retry_count + 1 < max_attempts). Returns the retry delay in seconds, or None when the job was
+    not retried (attempts exhausted or no longer processing).
+    """
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        for op in _WINDOW_OPS:
+            row = await conn.fetchrow(
                 f"""
-                SELECT * FROM public.jobs WHERE {where_clause}
-                ORDER BY created_at DESC
-                LIMIT ${n} OFFSET ${n + 1}
-                """,
-                *params,
-            )
-            return [dict(r) for r in rows], total
-
-
-async def find_stuck_jobs() -> list[dict[str, Any]]:
-    """Find jobs stuck in processing (updated_at older than timeout)."""
-    url = load_settings().transaction_pooler_url
-    timeout_min = load_settings().job_stuck_timeout_minutes
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT * FROM public.jobs
-                WHERE status = 'processing' AND updated_at < NOW() - INTERVAL '1 minute' * $1
+                WITH job AS (
+                    UPDATE public.jobs SET
+                        status = $2, retry_count = retry_count + 1, updated_at = NOW(),
+                        started_at = NULL, error_message = $4, error_type = $5
+                    WHERE id = $1 AND status = $3 AND retry_count + 1 < $6
+                        AND created_at {op} NOW() - INTERVAL '1 day' * $12
+                    RETURNING id, job_type, user_id, job_parameters, status, priority,
+                        {_BACKOFF_SQL.format(max="$8", base="$7", attempts="(retry_count - 1)")}
+                            AS delay
+                ), msg AS (
+                    SELECT pgmq.send(
+                        COALESCE(
+                            $11::text, {QUEUE_NAME_SQL.format(tier="$9", priority="job.priority")}
+                        ),
+                        jsonb_build_object(
+                            'job_id', job.id, 'job_type', job.job_type,
+                            'user_id', job.user_id, 'job_parameters', job.job_parameters
+                        ),
+                        job.delay
+                    ) AS msg_id
+                    FROM job
+                )
+                SELECT job.delay,
+                    pg_notify(
+                        $10,
+                        json_build_object(
+                            'id', job.id, 'user_id', job.user_id, 'status', job.status
+                        )::text
+                    )
+                FROM job, msg
                 """,
-                timeout_min,
+                job_id,
+                JobStatus.PENDING.value,
+                JobStatus.PROCESSING.value,
+                error_message,
+                error_type,
+                max_attempts,
+                backoff_seconds,
+                max_backoff_seconds,
+                tier,
+                JOB_STATUS_CHANNEL,
+                queue,
+                load_settings().recovery_window_days,
             )
-            return [dict(r) for r in rows]
-
-
-async def find_orphaned_jobs() -> list[dict[str, Any]]:
-    """Find orphaned pending jobs (created_at older than timeout)."""
-    url = load_settings().transaction_pooler_url
-    timeout_min = load_settings().job_stuck_timeout_minutes
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                SELECT * FROM public.jobs
-                WHERE status = 'pending' AND created_at < NOW() - INTERVAL '1 minute' * $1 AND retry_count < 2
-                """,
-                timeout_min,
+            if row is not None:
+                return row["delay"]
+        return None
+
+
+async def _recover_jobs_chunk(
+    where: str,
+    order_by: str,
+    timeout_seconds: float,
+    limit: int,
+    policies: dict[str, tuple[int, float, float, str]],
+    error_message: str,
+    error_type: str,
+    enqueue: bool = True,
+) -> list[dict[str, Any]]:
+    """Recover up to limit jobs matching where ($1 = timeout_seconds) in one statement.
+
+    Rows locked by another sweeper are skipped.
+
+    policies is {job_type: (max_attempts, backoff_seconds, max_backoff_seconds, tier)}. Jobs with
+    attempts left go back to pending with retry_count + 1 and (with enqueue) a delayed PGMQ
+    message on their lane; the rest (and unknown types) are failed. Returns recovered jobs
+    (id, job_type, user_id, job_parameters, status).
+    """
+    settings = load_settings()
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            f"""
+            WITH policy AS (
+                SELECT * FROM unnest(
+                    $7::text[], $8::int[], $9::float8[], $10::float8[], $11::text[]
+                ) AS p(job_type, max_attempts, backoff_seconds, max_backoff_seconds, tier)
+            ), picked AS (
+                SELECT j.id, j.created_at, p.tier,
+                    j.retry_count + 1 < COALESCE(p.max_attempts, 1) AS can_retry,
+                    {_BACKOFF_SQL.format(
+                        max="p.max_backoff_seconds",
+                        base="p.backoff_seconds",
+                        attempts="j.retry_count",
+                    )} AS delay
+                FROM public.jobs j LEFT JOIN policy p ON p.job_type = j.job_type
+                -- created_at bound prunes the scan to recent partitions
+                WHERE {where} AND j.created_at > NOW() - INTERVAL '1 day' * $13
+                ORDER BY {order_by}
+                LIMIT $2
+                FOR UPDATE OF j SKIP LOCKED
+            ), recovered AS (
+                UPDATE public.jobs AS j SET
+                    status = CASE WHEN picked.can_retry THEN $3 ELSE $4 END,
+                    retry_count = j.retry_count + CASE WHEN picked.can_retry THEN 1 ELSE 0 END,
+                    error_message = $5, error_type = $6, error_context = '{{}}'::jsonb,
+                    updated_at = NOW(),
+                    started_at = CASE WHEN picked.can_retry THEN NULL ELSE j.started_at END,
+                    completed_at = CASE WHEN picked.can_retry THEN NULL ELSE NOW() END
+                FROM picked
+                WHERE j.id = picked.id AND j.created_at = picked.created_at
+                RETURNING j.id, j.job_type, j.user_id, j.job_parameters, j.status, j.priority,
+                    picked.tier, picked.delay
+            ), msgs AS (
+                SELECT pgmq.send(
+                    {QUEUE_NAME_SQL.format(tier="r.tier", priority="r.priority")},
+                    jsonb_build_object(
+                        'job_id', r.id, 'job_type', r.job_type,
+                        'user_id', r.user_id, 'job_parameters', r.job_parameters
+                    ),
+                    r.delay
+                ) AS msg_id
+                FROM recovered r
+                WHERE r.status = $3 AND $14
             )
-            return [dict(r) for r in rows]
+            SELECT r.id, r.job_type, r.user_id, r.job_parameters, r.status,
+                pg_notify(
+                    $12,
+                    json_build_object('id', r.id, 'user_id', r.user_id, 'status', r.status)::text
+                )
+            FROM recovered r
+            WHERE (SELECT count(*) FROM msgs) >= 0  -- forces the msgs CTE to run
+            """,
+            timeout_seconds,
+            limit,
+            JobStatus.PENDING.value,
+            JobStatus.FAILED.value,
+            error_message,
+            error_type,
+            list(policies),
+            [p[0] for p in policies.values()],
+            [p[1] for p in policies.values()],
+            [p[2] for p in policies.values()],
+            [p[3] for p in policies.values()],
+            JOB_STATUS_CHANNEL,
+            settings.recovery_window_days,
+            enqueue,
+        )
+        return [
+            {k: r[k] for k in ("id", "job_type", "user_id", "job_parameters", "status")}
+            for r in rows
+        ]
+
+
+@observe_db
+async def recover_stuck_jobs(
+    limit: int, policies: dict[str, tuple[int, float, float, str]], enqueue: bool = True
+) -> list[dict[str, Any]]:
+    """Retry or fail one chunk of jobs stuck in processing.
+
+    A job is stuck once its heartbeat is older than the heartbeat timeout; jobs without one
+    (claimed before heartbeats existed) fall back to updated_at. The partial processing index
+    narrows the scan to in-flight rows; heartbeat_at itself is deliberately unindexed so
+    heartbeat writes stay HOT updates.
+    """
+    return await _recover_jobs_chunk(
+        "j.status = 'processing'"
+        " AND COALESCE(j.heartbeat_at, j.updated_at) < NOW() - INTERVAL '1 second' * $1",
+        "j.updated_at",
+        load_settings().job_heartbeat_timeout_seconds,
+        limit,
+        policies,
+        "Job exceeded maximum processing time",
+        "JobTimeoutError",
+        enqueue,
+    )
+
 
+def _queued_job_ids_sql() -> str:
+    """job_id of every message in any job queue (visible, delayed or deferred)."""
+    return " UNION ALL ".join(
+        f"SELECT message->>'job_id' AS job_id FROM pgmq.q_{name}" for name in all_queue_names()
+    )
 
-async def mark_job_failed(job_id: str, error_message: str, error_type: str) -> None:
-    """Mark job as failed."""
-    await update_job_status(job_id, JobStatus.FAILED.value)
-    await store_error_info(job_id, error_message, error_type)
+
+@observe_db
+async def recover_orphaned_jobs(
+    limit: int, policies: dict[str, tuple[int, float, float, str]], enqueue: bool = True
+) -> list[dict[str, Any]]:
+    """Retry or fail one chunk of orphaned pending jobs (not picked up since they were last queued).
+
+    A pending job with a message still in a queue is waiting its turn (behind a backfill,
+    deferred by USER_MAX_IN_FLIGHT, or a delayed retry), not orphaned; only jobs with no
+    message left qualify.
+    """
+    return await _recover_jobs_chunk(
+        "j.status = 'pending' AND j.updated_at < NOW() - INTERVAL '1 second' * $1"
+        f" AND NOT EXISTS (SELECT 1 FROM ({_queued_job_ids_sql()}) q WHERE q.job_id = j.id::text)",
+        "j.updated_at",
+        load_settings().job_stuck_timeout_minutes * 60,
+        limit,
+        policies,
+        "Job never started (pending timeout)",
+        "PendingTimeoutError",
+        enqueue,
+    )
+
+
+async def mark_job_failed(
+    job_id: str,
+    error_message: str,
+    error_type: str,
+    error_context: dict | None = None,
+) -> bool:
+    """pending/processing -> failed with error info. False if the job already finished."""
+    return await transition_job(
+        job_id,
+        JobStatus.FAILED.value,
+        (JobStatus.PENDING.value, JobStatus.PROCESSING.value),
+        error_message=error_message,
+        error_type=error_type,
+        error_context=error_context or {},
+    )
@@ -0,0 +1 @@
+"""Job handlers, one module per job type (imported lazily by the registry)."""
@@ -0,0 +1,6 @@
+"""sample_task handler."""
+
+
+async def run(job_id: str, user_id: str, job_parameters: dict) -> dict:
+    """Minimal logic for sample worker."""
+    return {"completed": True}
@@ -0,0 +1,60 @@
+"""Coalesced job heartbeats.
+
+One batched UPDATE per interval covers every job processing in this process.
+"""
+import asyncio
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+
+from src.models.config import load_settings
+from src.utils.logging import get_logger
+
+from . import database
+
+logger = get_logger(__name__)
+
+
+class HeartbeatBatcher:
+    """Tracks in-flight job ids and refreshes their heartbeat_at together every interval.
+
+    The flush task only runs while something is tracked, so idle workers issue no writes. A job
+    stops heartbeating when its handler finishes or the process dies; recovery keys off that.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._jobs: Counter[str] = Counter()
+        self._task: asyncio.Task | None = None
+
+    @contextmanager
+    def track(self, job_id: str) -> Iterator[None]:
+        """Heartbeat job_id while the block runs (the claim itself sets the first heartbeat)."""
+        self._jobs[job_id] += 1
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            yield
+        finally:
+            self._jobs[job_id] -= 1
+            if self._jobs[job_id] <= 0:
+                del self._jobs[job_id]
+
+    async def _run(self) -> None:
+        while self._jobs:
+            await asyncio.sleep(self._interval)
+            job_ids = list(self._jobs)
+            if not job_ids:
+                break
+            try:
+                await database.heartbeat_jobs(job_ids)
+            except Exception as e:
+                # Missed beats only matter once they add up to the heartbeat timeout.
+                logger.warning(f"job heartbeat failed jobs={len(job_ids)} error={e}")
+
+
+@lru_cache
+def get_heartbeat_batcher() -> HeartbeatBatcher:
+    """Get process-wide heartbeat batcher (JOB_HEARTBEAT_INTERVAL_SECONDS)."""
+    return HeartbeatBatcher(load_settings().job_heartbeat_interval_seconds)
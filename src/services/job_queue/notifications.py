@@ -0,0 +1,113 @@
+"""Job status LISTEN/NOTIFY fan-out: one listener connection per process, many waiters."""
+import asyncio
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+
+import asyncpg
+
+from src.models.config import load_settings
+from src.utils.logging import get_logger
+
+from .database import JOB_STATUS_CHANNEL
+
+logger = get_logger(__name__)
+
+# Backoff cap between reconnect attempts (seconds).
+_MAX_RECONNECT_DELAY = 30
+
+
+class JobStatusListener:
+    """LISTENs on JOB_STATUS_CHANNEL and delivers payloads to per-job subscriber queues.
+
+    LISTEN needs a session, so this uses SESSION_POOLER_URL; a transaction-mode pooler accepts
+    LISTEN but never delivers notifications. With no url the listener stays disconnected and
+    waiters fall back to polling.
+    """
+
+    def __init__(self, url: str | None) -> None:
+        self._url = url
+        self._conn: asyncpg.Connection | None = None
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+    @property
+    def connected(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    @contextmanager
+    def subscribe(self, job_id: str) -> Iterator[asyncio.Queue]:
+        """Queue receiving {"id", "user_id", "status"} dicts for job_id while the block runs."""
+        q: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(q)
+        try:
+            yield q
+        finally:
+            subs = self._subscribers.get(job_id)
+            if subs is not None:
+                subs.discard(q)
+                if not subs:
+                    del self._subscribers[job_id]
+
+    def _on_notify(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        for q in self._subscribers.get(str(event.get("id")), ()):
+            q.put_nowait(event)
+
+    def _on_terminate(self, conn: asyncpg.Connection) -> None:
+        self._conn = None
+        if not self._closing:
+            logger.warning("job status listener connection lost, reconnecting")
+            self.start()
+
+    async def _connect_loop(self) -> None:
+        delay = 1.0
+        while not self._closing:
+            try:
+                conn = await asyncpg.connect(self._url)
+                conn.add_termination_listener(self._on_terminate)
+                await conn.add_listener(JOB_STATUS_CHANNEL, self._on_notify)
+                self._conn = conn
+                return
+            except Exception as e:
+                logger.warning(f"job status listener connect failed error={e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_RECONNECT_DELAY)
+
+    def start(self) -> None:
+        """Connect in the background (API lifespan); reconnects on connection loss."""
+        if self._url is None:
+            return
+        self._closing = False
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._connect_loop())
+
+    async def stop(self) -> None:
+        """Close the listener connection."""
+        self._closing = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            await conn.close()
+
+
+@lru_cache
+def get_job_status_listener() -> JobStatusListener:
+    """Get process-wide job status listener."""
+    settings = load_settings()
+    if not settings.session_pooler_url:
+        logger.warning(
+            "SESSION_POOLER_URL not set: job status notifications disabled, waiters poll"
+        )
+    return JobStatusListener(settings.session_pooler_url or None)
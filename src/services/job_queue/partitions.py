@@ -0,0 +1,250 @@
+"""jobs table partition maintenance.
+
+Monthly range partitions on created_at, retention, and PGMQ archive purge.
+"""
+import re
+from datetime import UTC, datetime, timedelta
+
+import asyncpg
+
+from src.config.database import get_pool
+from src.models.config import load_settings
+from src.utils.logging import get_logger
+
+from . import payloads
+from .queue import RETRY_QUEUE_NAME, all_queue_names
+
+logger = get_logger(__name__)
+
+# Compact copy of retired jobs: no parameters, results or error context.
+JOBS_ARCHIVE_SQL = """
+CREATE TABLE IF NOT EXISTS public.jobs_archive (
+    id UUID NOT NULL,
+    job_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    priority TEXT NOT NULL,
+    user_id UUID NOT NULL,
+    retry_count INT NOT NULL,
+    error_type TEXT,
+    created_at TIMESTAMPTZ NOT NULL,
+    completed_at TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS jobs_archive_user_created_idx
+    ON public.jobs_archive (user_id, created_at DESC);
+"""
+
+# Jobs rows are updated a few times each (pending -> processing -> done): leave page room for HOT
+# updates and vacuum small partitions early, so each vacuum pass stays short.
+PARTITION_STORAGE = (
+    "fillfactor = 90, "
+    "autovacuum_vacuum_scale_factor = 0.02, "
+    "autovacuum_analyze_scale_factor = 0.02"
+)
+
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def _month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value: datetime) -> datetime:
+    return _month_start(value + timedelta(days=32))
+
+
+def partition_name(month: datetime) -> str:
+    """Partition holding jobs created in month, e.g. jobs_p202610."""
+    return f"jobs_p{month:%Y%m}"
+
+
+async def ensure_partitions(conn: asyncpg.Connection, months_ahead: int) -> list[str]:
+    """Create monthly partitions from the current month through months_ahead. Returns created names.
+
+    Months already covered (including by a converted legacy partition) are skipped.
+    """
+    created = []
+    month = _month_start(datetime.now(UTC))
+    for _ in range(months_ahead + 1):
+        name = partition_name(month)
+        upper = _next_month(month)
+        if await conn.fetchval("SELECT to_regclass($1) IS NULL", f"public.{name}"):
+            try:
+                # Savepoint when called inside a transaction (baseline migration): the overlap
+                # error must not abort the caller's transaction.
+                async with conn.transaction():
+                    await conn.execute(
+                        f"CREATE TABLE public.{name} PARTITION OF public.jobs "
+                        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{upper.isoformat()}') "
+                        f"WITH ({PARTITION_STORAGE})"
+                    )
+                created.append(name)
+            except asyncpg.exceptions.InvalidObjectDefinitionError:
+                pass  # Range already covered by another partition
+        month = upper
+    return created
+
+
+async def list_partitions(conn: asyncpg.Connection) -> list[tuple[str, datetime | None]]:
+    """(name, upper bound) of every jobs partition, oldest first; upper bound None for MAXVALUE."""
+    rows = await conn.fetch(
+        """
+        SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'public.jobs'::regclass
+        """
+    )
+    partitions = []
+    for row in rows:
+        match = _UPPER_BOUND.search(row["bound"])
+        partitions.append((row["name"], datetime.fromisoformat(match.group(1)) if match else None))
+    return sorted(partitions, key=lambda p: p[1] or datetime.max.replace(tzinfo=UTC))
+
+
+async def create_index_concurrently(conn: asyncpg.Connection, name: str, definition: str) -> None:
+    """Build an index on every jobs partition without blocking writes, then attach them.
+
+    Postgres has no CREATE INDEX CONCURRENTLY on a partitioned table, so the parent index is
+    created ON ONLY (invalid), each partition is indexed concurrently, and the parent becomes
+    valid once all are attached; later partitions inherit it. definition is the part after the
+    table, e.g. "(updated_at) WHERE status = 'processing'". Safe to re-run after a failure.
+    Must run outside a transaction.
+    """
+    await conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY public.jobs {definition}")
+    for partition, _ in await list_partitions(conn):
+        child = f"{partition}_{name.removeprefix('jobs_')}"
+        # An interrupted concurrent build leaves an invalid index behind; rebuild it.
+        if await conn.fetchval(
+            "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass($1)",
+            f"public.{child}",
+        ):
+            await conn.execute(f"DROP INDEX CONCURRENTLY public.{child}")
+        await conn.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {child} ON public.{partition} {definition}"
+        )
+        await conn.execute(f"ALTER INDEX public.{name} ATTACH PARTITION public.{child}")
+
+
+async def _detached_partitions(conn: asyncpg.Connection) -> list[str]:
+    """jobs partitions detached by an earlier retire_partitions run but not yet dropped."""
+    rows = await conn.fetch(
+        r"""
+        SELECT c.relname FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'public' AND c.relkind = 'r' AND NOT c.relispartition
+            AND (c.relname ~ '^jobs_p\d{6}$' OR c.relname = 'jobs_legacy')
+        ORDER BY c.relname
+        """
+    )
+    return [r["relname"] for r in rows]
+
+
+async def retire_partitions(conn: asyncpg.Connection, retention_days: int, mode: str) -> list[str]:
+    """Detach partitions whose newest possible row is older than retention_days.
+
+    Each detached partition is then archived or dropped.
+
+    mode "archive" copies the rows' compact columns into jobs_archive first; "drop" discards them.
+    Payloads the rows offloaded to storage are deleted once the drop has committed. DETACH ...
+    CONCURRENTLY only briefly locks the parent, so API traffic keeps flowing. Resumable: detaches
+    interrupted on an earlier run are finalized, and tables detached but not dropped are picked up.
+    """
+    for row in await conn.fetch(
+        "SELECT inhrelid::regclass::text AS name FROM pg_inherits "
+        "WHERE inhparent = 'public.jobs'::regclass AND inhdetachpending"
+    ):
+        await conn.execute(f"ALTER TABLE public.jobs DETACH PARTITION {row['name']} FINALIZE")
+    cutoff = datetime.now(UTC) - timedelta(days=retention_days)
+    for name, upper in await list_partitions(conn):
+        if upper is not None and upper <= cutoff:
+            await conn.execute(
+                f"ALTER TABLE public.jobs DETACH PARTITION public.{name} CONCURRENTLY"
+            )
+
+    retired = []
+    for name in await _detached_partitions(conn):
+        refs = await conn.fetch(
+            f"""
+            SELECT job_parameters, data_references FROM public.{name}
+            WHERE job_parameters ? $1 OR data_references ? $1
+            """,
+            payloads.REF_KEY,
+        )
+        async with conn.transaction():
+            if mode == "archive":
+                await conn.execute(
+                    f"""
+                    INSERT INTO public.jobs_archive (
+                        id, job_type, status, priority, user_id, retry_count, error_type,
+                        created_at, completed_at
+                    )
+                    SELECT id, job_type, status, priority, user_id, retry_count, error_type,
+                        created_at, completed_at
+                    FROM public.{name}
+                    """
+                )
+            await conn.execute(f"DROP TABLE public.{name}")
+        await payloads.delete([value for row in refs for value in row.values()])
+        retired.append(name)
+    return retired
+
+
+async def purge_queue_archives(conn: asyncpg.Connection, retention_days: int) -> int:
+    """Delete PGMQ archive rows (pgmq.a_<queue>) older than retention_days. Returns rows deleted."""
+    deleted = 0
+    for name in all_queue_names():
+        if await conn.fetchval("SELECT to_regclass($1) IS NULL", f"pgmq.a_{name}"):
+            continue
+        result = await conn.execute(
+            f"DELETE FROM pgmq.a_{name} WHERE archived_at < NOW() - INTERVAL '1 day' * $1",
+            retention_days,
+        )
+        deleted += int(result.split()[-1])
+    return deleted
+
+
+async def purge_lane_messages(conn: asyncpg.Connection, older_than_seconds: float) -> int:
+    """Delete lane messages enqueued more than older_than_seconds ago.
+
+    Used in spawn mode, where nothing reads the lanes.
+
+    Spawn mode no longer enqueues lane messages; this clears ones left from before that, or from a
+    switch out of consumer mode, so they neither grow the q_* tables nor hide orphans from recovery
+    (which then re-dispatches their jobs). Returns messages deleted.
+    """
+    deleted = 0
+    for name in all_queue_names():
+        if name == RETRY_QUEUE_NAME:
+            continue
+        result = await conn.execute(
+            f"DELETE FROM pgmq.q_{name} WHERE enqueued_at < NOW() - INTERVAL '1 second' * $1",
+            older_than_seconds,
+        )
+        deleted += int(result.split()[-1])
+    return deleted
+
+
+async def maintain_job_storage() -> dict[str, int]:
+    """Create upcoming partitions, retire expired ones and purge old PGMQ archives.
+
+    In spawn mode, stale lane messages are purged too. Scheduled daily.
+    """
+    settings = load_settings()
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        created = await ensure_partitions(conn, settings.job_partition_months_ahead)
+        retired = await retire_partitions(
+            conn, settings.job_retention_days, settings.job_retention_mode
+        )
+        purged = await purge_queue_archives(conn, settings.queue_archive_retention_days)
+        lane_purged = 0
+        if settings.job_dispatch_mode == "spawn":
+            lane_purged = await purge_lane_messages(conn, settings.job_stuck_timeout_minutes * 60)
+    logger.info(
+        f"job storage maintenance created={created} retired={retired} "
+        f"queue_archive_purged={purged} lane_messages_purged={lane_purged}"
+    )
+    return {
+        "created": len(created),
+        "retired": len(retired),
+        "queue_archive_purged": purged,
+        "lane_messages_purged": lane_purged,
+    }
@@ -0,0 +1,132 @@
+"""Large job payloads in Supabase Storage: rows and queue messages keep only a small reference."""
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+from uuid import uuid4
+
+import httpx
+from storage3.exceptions import StorageApiError
+
+from src.config.supabase import get_supabase_client
+from src.models.config import load_settings
+from src.utils import serialization
+from src.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Stored payloads are replaced by {REF_KEY: {"bucket", "path", "size"}}.
+REF_KEY = "$payload"
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+# Paths per storage remove call.
+_DELETE_BATCH_SIZE = 1000
+
+
+def is_ref(value: Any) -> bool:
+    """Whether value is a payload reference written by offload."""
+    return isinstance(value, dict) and len(value) == 1 and isinstance(value.get(REF_KEY), dict)
+
+
+async def offload(user_id: str, kind: str, value: dict | None) -> dict | None:
+    """Return value, or a reference to it in storage when its JSON exceeds PAYLOAD_OFFLOAD_BYTES.
+
+    kind names the object ("parameters", "result"); objects live under {user_id}/{uuid}/.
+    """
+    settings = load_settings()
+    if value is None or is_ref(value) or settings.payload_offload_bytes <= 0:
+        return value
+    body = serialization.dumps(value)
+    if len(body) <= settings.payload_offload_bytes:
+        return value
+    path = f"{user_id}/{uuid4()}/{kind}.json"
+    bucket = get_supabase_client().storage.from_(settings.payload_bucket)
+    # The Supabase client is synchronous; keep the upload off the event loop.
+    await asyncio.to_thread(bucket.upload, path, body, {"content-type": "application/json"})
+    return {REF_KEY: {"bucket": settings.payload_bucket, "path": path, "size": len(body)}}
+
+
+async def resolve(value: dict | None) -> dict | None:
+    """Inverse of offload: download and decode a reference; anything else is returned unchanged."""
+    if not is_ref(value):
+        return value
+    ref = value[REF_KEY]
+    bucket = get_supabase_client().storage.from_(ref["bucket"])
+    return serialization.loads(await asyncio.to_thread(bucket.download, ref["path"]))
+
+
+async def delete(values: list[dict | None]) -> int:
+    """Delete the objects behind references in values; anything else is skipped.
+
+    Returns objects deleted. Best-effort: failures are logged, not raised, since the job row is
+    already gone or rejected.
+    """
+    paths: dict[str, list[str]] = {}
+    for value in values:
+        if is_ref(value):
+            ref = value[REF_KEY]
+            paths.setdefault(ref["bucket"], []).append(ref["path"])
+    deleted = 0
+    for bucket_name, bucket_paths in paths.items():
+        bucket = get_supabase_client().storage.from_(bucket_name)
+        for i in range(0, len(bucket_paths), _DELETE_BATCH_SIZE):
+            batch = bucket_paths[i : i + _DELETE_BATCH_SIZE]
+            try:
+                await asyncio.to_thread(bucket.remove, batch)
+                deleted += len(batch)
+            except Exception as e:
+                logger.warning(
+                    f"payload delete failed bucket={bucket_name} count={len(batch)} error={e}"
+                )
+    return deleted
+
+
+class PayloadNotFoundError(Exception):
+    """The referenced object is not in storage (deleted, or never uploaded)."""
+
+
+async def open_stream(value: dict, expires_in: int = 60) -> AsyncIterator[bytes]:
+    """Start downloading a referenced payload via a short-lived signed URL.
+
+    The returned iterator yields its bytes in chunks.
+
+    The upstream request is sent and its status checked before this returns, so callers can still
+    turn failures into an error response. Raises PayloadNotFoundError for a missing object and
+    httpx.HTTPError for other storage failures.
+    """
+    ref = value[REF_KEY]
+    bucket = get_supabase_client().storage.from_(ref["bucket"])
+    try:
+        signed = await asyncio.to_thread(bucket.create_signed_url, ref["path"], expires_in)
+    except StorageApiError as e:
+        raise PayloadNotFoundError(ref["path"]) from e
+    url = signed.get("signedURL") or signed["signedUrl"]
+    client = httpx.AsyncClient(timeout=30)
+    try:
+        response = await client.send(client.build_request("GET", url), stream=True)
+        if response.status_code in (400, 404):
+            raise PayloadNotFoundError(ref["path"])
+        response.raise_for_status()
+    except BaseException:
+        await client.aclose()
+        raise
+    return _iter_response(client, response)
+
+
+async def _iter_response(
+    client: httpx.AsyncClient, response: httpx.Response
+) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in response.aiter_bytes(_STREAM_CHUNK_SIZE):
+            yield chunk
+    finally:
+        await response.aclose()
+        await client.aclose()
+
+
+async def stream(value: dict, expires_in: int = 60) -> AsyncIterator[bytes]:
+    """Stream a referenced payload's bytes in chunks via a short-lived signed URL.
+
+    The payload is never buffered whole.
+    """
+    async for chunk in await open_stream(value, expires_in):
+        yield chunk
@@ -1,41 +1,103 @@
-"""PGMQ queue operations."""
-import json
+"""PGMQ queue operations: one queue per (tier, priority) lane."""
+from src.config.database import get_pool
+from src.models.jobs.job_definition import JobPriority, JobTier
+from src.utils.metrics import observe_db
 
-import asyncpg
+from .registry import TIER_FUNCTIONS, get_job_definition
 
-from src.models.config import load_settings
+# Pre-lane queue; still created by migrate.py and drained by consumers for messages
+# enqueued before lanes.
+LEGACY_QUEUE_NAME = "job_queue"
+# Spawn mode: delayed retry messages, re-dispatched by run_retry_dispatcher once their
+# delay elapses.
+RETRY_QUEUE_NAME = "job_queue_retry"
 
-QUEUE_NAME = "job_queue"
+PRIORITIES: tuple[JobPriority, ...] = ("interactive", "bulk")
+# Consumer read share per priority: interactive lanes get 4 slots for every bulk slot.
+PRIORITY_WEIGHTS: dict[str, int] = {"interactive": 4, "bulk": 1}
 
+# SQL twin of queue_name(); used where the lane is derived per row inside a statement.
+QUEUE_NAME_SQL = "'job_queue_' || {tier} || '_' || {priority}"
 
-async def send_job_message(job_id: str, job_type: str, user_id: str, job_parameters: dict) -> int | None:
-    """Send job message to PGMQ. Returns msg_id or None."""
-    url = load_settings().transaction_pooler_url
-    msg = json.dumps({"job_id": job_id, "job_type": job_type, "user_id": user_id, "job_parameters": job_parameters})
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            row = await conn.fetchrow("SELECT pgmq.send($1, $2) as msg_id", QUEUE_NAME, msg)
-            return row["msg_id"] if row else None
 
+def queue_name(tier: JobTier, priority: JobPriority) -> str:
+    """PGMQ queue for a lane, e.g. job_queue_gpu_bulk."""
+    return f"job_queue_{tier}_{priority}"
 
-async def read_job_messages(qty: int = 10, vt: int = 300) -> list[dict]:
-    """Read messages from PGMQ. vt=visibility timeout in seconds."""
-    url = load_settings().transaction_pooler_url
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            rows = await conn.fetch(
-                "SELECT * FROM pgmq.read(queue_name => $1, vt => $2, qty => $3)",
-                QUEUE_NAME,
-                vt,
-                qty,
-            )
-            return [dict(r) for r in rows]
 
+def route_job(job_type: str, priority: JobPriority) -> str:
+    """Queue a job is enqueued on: its registry tier and priority.
 
-async def delete_job_message(msg_id: int) -> bool:
+    Raises ValueError for unknown types.
+    """
+    return queue_name(get_job_definition(job_type).tier, priority)
+
+
+def all_queue_names() -> list[str]:
+    """Every lane queue plus the legacy and retry queues (migrations, metrics, retention)."""
+    lanes = [queue_name(tier, priority) for tier in TIER_FUNCTIONS for priority in PRIORITIES]
+    return lanes + [LEGACY_QUEUE_NAME, RETRY_QUEUE_NAME]
+
+
+@observe_db
+async def read_job_messages(queue: str, qty: int = 10, vt: int = 300) -> list[dict]:
+    """Read messages from a PGMQ queue. vt=visibility timeout in seconds."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT * FROM pgmq.read(queue_name => $1, vt => $2, qty => $3)",
+            queue,
+            vt,
+            qty,
+        )
+        return [dict(r) for r in rows]
+
+
+@observe_db
+async def delete_job_message(queue: str, msg_id: int) -> bool:
     """Delete message from PGMQ."""
-    url = load_settings().transaction_pooler_url
-    async with asyncpg.create_pool(url, min_size=1, max_size=5) as pool:
-        async with pool.acquire() as conn:
-            row = await conn.fetchrow("SELECT pgmq.delete($1, $2) as deleted", QUEUE_NAME, msg_id)
-            return bool(row and row["deleted"])
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            "SELECT pgmq.delete($1::text, $2::bigint) as deleted",
+            queue,
+            msg_id,
+        )
+        return bool(row and row["deleted"])
+
+
+@observe_db
+async def archive_job_message(queue: str, msg_id: int) -> bool:
+    """Move message to the PGMQ archive table."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            "SELECT pgmq.archive($1::text, $2::bigint) as archived",
+            queue,
+            msg_id,
+        )
+        return bool(row and row["archived"])
+
+
+@observe_db
+async def defer_job_message(queue: str, msg_id: int, seconds: int) -> None:
+    """Hide a read message for seconds without acking it (pgmq.set_vt)."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        await conn.execute(
+            "SELECT pgmq.set_vt($1::text, $2::bigint, $3::int)",
+            queue,
+            msg_id,
+            seconds,
+        )
+
+
+@observe_db
+async def get_all_queue_metrics() -> list[dict]:
+    """Depth and oldest message age of every PGMQ queue in one call (pgmq.metrics_all)."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            "SELECT queue_name, queue_length, oldest_msg_age_sec FROM pgmq.metrics_all()"
+        )
+        return [dict(r) for r in rows]
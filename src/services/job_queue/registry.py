@@ -0,0 +1,104 @@
+"""Job handler registry: one table drives validation, routing and dispatch."""
+import importlib
+from collections.abc import Awaitable, Callable
+from functools import lru_cache
+from typing import Any
+
+from src.models.jobs.job_definition import JobDefinition, JobTier
+from src.models.jobs.job_status import JobType
+
+# handler(job_id, user_id, job_parameters) -> data_references
+JobHandler = Callable[[str, str, dict], Awaitable[dict | None]]
+
+# Tier -> Modal function and its timeout (seconds);
+# keep in sync with src/deployment/modal_workers.py.
+TIER_FUNCTIONS: dict[JobTier, str] = {
+    "sample": "process_sample_job",
+    "gpu": "process_gpu_job",
+    "browser": "process_browser_job",
+    "llm": "process_llm_job",
+    "api": "process_api_job",
+}
+TIER_TIMEOUTS: dict[JobTier, int] = {
+    "sample": 300,
+    "gpu": 900,
+    "browser": 300,
+    "llm": 300,
+    "api": 120,
+}
+
+JOB_REGISTRY: dict[str, JobDefinition] = {}
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for failures a retry cannot fix (bad input, missing resource)."""
+
+
+def register(definition: JobDefinition) -> JobDefinition:
+    """Add a job type to the registry."""
+    if definition.job_type in JOB_REGISTRY:
+        raise ValueError(f"Duplicate job_type: {definition.job_type}")
+    if definition.timeout_seconds >= TIER_TIMEOUTS[definition.tier]:
+        raise ValueError(
+            f"timeout_seconds for {definition.job_type} must be below the "
+            f"{definition.tier} tier timeout ({TIER_TIMEOUTS[definition.tier]}s)"
+        )
+    JOB_REGISTRY[definition.job_type] = definition
+    return definition
+
+
+def get_job_definition(job_type: str) -> JobDefinition:
+    """Definition for job_type. Raises ValueError for unregistered types."""
+    definition = JOB_REGISTRY.get(job_type)
+    if definition is None:
+        raise ValueError(f"Invalid job_type: {job_type}")
+    return definition
+
+
+def get_tier_function(job_type: str) -> str:
+    """Modal function name that runs job_type."""
+    return TIER_FUNCTIONS[get_job_definition(job_type).tier]
+
+
+def get_retry_policies() -> dict[str, tuple[int, float, float, str]]:
+    """{job_type: (max_attempts, backoff_seconds, max_backoff_seconds, tier)}.
+
+    Used by set-based recovery.
+    """
+    return {
+        job_type: (
+            d.retry.max_attempts,
+            d.retry.backoff_seconds,
+            d.retry.max_backoff_seconds,
+            d.tier,
+        )
+        for job_type, d in JOB_REGISTRY.items()
+    }
+
+
+@lru_cache
+def _import(path: str) -> Any:
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def get_handler(job_type: str) -> JobHandler:
+    """Handler for job_type, importing its module on first use."""
+    return _import(get_job_definition(job_type).handler)
+
+
+def validate_job_parameters(job_type: str, job_parameters: dict) -> None:
+    """Raise ValueError for unknown job types or parameters rejected by the type's validator."""
+    definition = get_job_definition(job_type)
+    if definition.validator:
+        _import(definition.validator)(job_parameters)
+
+
+register(
+    JobDefinition(
+        job_type=JobType.SAMPLE_TASK.value,
+        handler="src.services.job_queue.handlers.sample:run",
+        tier="sample",
+        timeout_seconds=240,
+    )
+)
@@ -1,12 +1,43 @@
 """Job queue service."""
-from datetime import datetime
+import asyncio
+import contextlib
+import time
+from collections.abc import AsyncIterator
 from uuid import UUID
 
-from src.models.jobs.job_status import JobStatus, JobType
+from src.models.config import load_settings
+from src.models.jobs.job import JOB_FIELDS, JOB_SUMMARY_FIELDS
+from src.models.jobs.job_definition import JobPriority
+from src.models.jobs.job_status import TERMINAL_STATUSES, JobStatus
+from src.utils.logging import get_logger
+from src.utils.metrics import JOBS
 
 from . import database
+from . import payloads
 from . import queue
+from . import registry
 from . import spawner
+from .cache import get_terminal_job_cache
+from .heartbeats import get_heartbeat_batcher
+from .notifications import JobStatusListener, get_job_status_listener
+
+logger = get_logger(__name__)
+
+# Per-type in-flight caps (JobDefinition.max_concurrency) for this worker process.
+_type_semaphores: dict[str, asyncio.Semaphore] = {}
+
+
+def _concurrency_slot(job_type: str) -> contextlib.AbstractAsyncContextManager:
+    try:
+        limit = registry.get_job_definition(job_type).max_concurrency
+    except ValueError:
+        limit = None
+    if limit is None:
+        return contextlib.nullcontext()
+    sem = _type_semaphores.get(job_type)
+    if sem is None:
+        sem = _type_semaphores[job_type] = asyncio.Semaphore(limit)
+    return sem
 
 
 class JobQueueService:
@@ -15,47 +46,258 @@ class JobQueueService:
     def __init__(self) -> None:
         pass
 
-    async def create_job(self, job_type: str, user_id: str, job_parameters: dict) -> dict:
-        """Create job, send to PGMQ, spawn Modal worker."""
+    async def create_job(
+        self, job_type: str, user_id: str, job_parameters: dict, priority: JobPriority | None = None
+    ) -> dict:
+        """Create job (with its PGMQ message in consumer mode, in one atomic statement).
+
+        In spawn mode a worker is spawned instead. priority picks the queue lane; None uses the
+        job type's default.
+        """
         self.validate_job_parameters(job_type, job_parameters)
 
-        job = await database.create_job(job_type, user_id, job_parameters)
+        priority = priority or registry.get_job_definition(job_type).priority
+        # Large parameters go to storage; the row, queue message and spawn args carry only
+        # the reference.
+        job_parameters = await payloads.offload(user_id, "parameters", job_parameters)
+        spawn = load_settings().job_dispatch_mode == "spawn"
+        try:
+            # Spawn mode hands the job to a worker directly; a lane message would never be read.
+            job = await database.create_job(
+                job_type, user_id, job_parameters, priority, enqueue=not spawn
+            )
+        except Exception:
+            await payloads.delete([job_parameters])
+            raise
         job_id = str(job["id"])
+        JOBS.inc(job_type, job["status"])
 
-        await queue.send_job_message(job_id, job_type, user_id, job_parameters)
-        await spawner.spawn_job(job_id, job_type, user_id, job_parameters)
+        if spawn:
+            await spawner.spawn_job(job_id, job_type, user_id, job_parameters)
 
         return job
 
+    async def create_jobs(
+        self, user_id: str, jobs: list[tuple[str, dict, JobPriority | None]]
+    ) -> list[dict]:
+        """Create many jobs: one INSERT + pgmq.send_batch statement, one spawn per tier.
+
+        jobs is [(job_type, job_parameters, priority)]. Returns one result per input, in order:
+        {"job": dict | None, "error": str | None}.
+        """
+        results: list[dict] = [{"job": None, "error": None} for _ in jobs]
+        valid: list[tuple[str, dict, JobPriority]] = []
+        valid_index: list[int] = []
+        for i, (job_type, job_parameters, priority) in enumerate(jobs):
+            try:
+                self.validate_job_parameters(job_type, job_parameters)
+                priority = priority or registry.get_job_definition(job_type).priority
+                valid.append((job_type, job_parameters, priority))
+                valid_index.append(i)
+            except ValueError as e:
+                results[i]["error"] = str(e)
+
+        spawn = load_settings().job_dispatch_mode == "spawn"
+        stored = await asyncio.gather(
+            *(
+                payloads.offload(user_id, "parameters", job_parameters)
+                for _, job_parameters, _ in valid
+            )
+        )
+        try:
+            created = await database.create_jobs(
+                user_id,
+                [
+                    (job_type, params, priority)
+                    for (job_type, _, priority), params in zip(valid, stored)
+                ],
+                enqueue=not spawn,
+            )
+        except Exception:
+            await payloads.delete(stored)
+            raise
+        messages = [
+            {
+                "job_id": str(job["id"]),
+                "job_type": job["job_type"],
+                "user_id": user_id,
+                "job_parameters": job["job_parameters"],
+            }
+            for job in created
+        ]
+        spawn_errors = await spawner.spawn_jobs(messages) if spawn else {}
+
+        for i, job in zip(valid_index, created):
+            JOBS.inc(job["job_type"], job["status"])
+            results[i]["job"] = job
+            results[i]["error"] = spawn_errors.get(str(job["id"]))
+        return results
+
     def validate_job_parameters(self, job_type: str, job_parameters: dict) -> None:
-        """Validate parameters per job type. No duplicate check for sample_task."""
-        if job_type not in [t.value for t in JobType]:
-            raise ValueError(f"Invalid job_type: {job_type}")
-        # sample_task has no required params; no duplicate check per spec
+        """Validate parameters per job type (registry validator).
+
+        No duplicate check for sample_task.
+        """
+        registry.validate_job_parameters(job_type, job_parameters)
 
-    async def process_job(self, job_id: str, job_type: str, user_id: str, job_parameters: dict) -> None:
-        """Process job (called from Modal worker)."""
-        await database.update_job_status(job_id, JobStatus.PROCESSING.value, started_at=datetime.utcnow())
+    async def process_job(
+        self,
+        job_id: str,
+        job_type: str,
+        user_id: str,
+        job_parameters: dict,
+        max_user_in_flight: int | None = None,
+    ) -> bool:
+        """Process job (called from Modal worker or consumer).
+
+        With max_user_in_flight, the job is only claimed while its user has fewer jobs processing;
+        returns False when it was left pending for that reason (the caller re-delivers it later).
+        """
+        # Wait for a slot before claiming, so queued jobs stay pending rather than processing.
+        async with _concurrency_slot(job_type):
+            if max_user_in_flight is None:
+                claimed = await database.start_job(job_id)
+            else:
+                outcome = await database.claim_job(job_id, max_user_in_flight)
+                if outcome == "busy":
+                    return False
+                claimed = outcome == "claimed"
+            if not claimed:
+                logger.warning(f"job not pending, skipping job_id={job_id}")
+                return True
+            JOBS.inc(job_type, JobStatus.PROCESSING.value)
+            with get_heartbeat_batcher().track(job_id):
+                await self._run_job(job_id, job_type, user_id, job_parameters)
+        return True
 
+    async def _run_job(
+        self, job_id: str, job_type: str, user_id: str, job_parameters: dict
+    ) -> int | None:
+        """Run the handler once on a claimed job.
+
+        Returns the retry delay in seconds if the job was re-queued.
+        """
+        definition = None
         try:
-            if job_type == JobType.SAMPLE_TASK.value:
-                # Minimal logic for sample worker
-                await database.store_data_references(job_id, {"completed": True})
-                await database.update_job_status(
+            definition = registry.get_job_definition(job_type)
+            handler = registry.get_handler(job_type)
+            params = job_parameters
+            if definition.resolve_payloads:
+                params = await payloads.resolve(job_parameters)
+            data_references = await asyncio.wait_for(
+                handler(job_id, user_id, params), timeout=definition.timeout_seconds
+            )
+            data_references = await payloads.offload(user_id, "result", data_references)
+        except Exception as e:
+            if definition is not None and not isinstance(e, registry.PermanentJobError):
+                policy = definition.retry
+                # Spawned workers have no queue reader: the retry dispatcher spawns the job once
+                # the delay elapses, instead of this worker sleeping through it.
+                spawn = load_settings().job_dispatch_mode == "spawn"
+                delay = await database.retry_job(
                     job_id,
-                    JobStatus.COMPLETED.value,
-                    started_at=datetime.utcnow(),
-                    completed_at=datetime.utcnow(),
+                    definition.tier,
+                    policy.max_attempts,
+                    policy.backoff_seconds,
+                    policy.max_backoff_seconds,
+                    str(e),
+                    type(e).__name__,
+                    queue.RETRY_QUEUE_NAME if spawn else None,
                 )
-            else:
-                raise ValueError(f"Unknown job_type: {job_type}")
-        except Exception as e:
-            await database.store_error_info(job_id, str(e), type(e).__name__, {"job_parameters": job_parameters})
-            await database.update_job_status(job_id, JobStatus.FAILED.value)
+                if delay is not None:
+                    JOBS.inc(job_type, "retried")
+                    logger.warning(
+                        f"job failed, retrying job_id={job_id} delay_s={delay} error={e}"
+                    )
+                    return delay
+            if await database.mark_job_failed(
+                job_id, str(e), type(e).__name__, {"job_parameters": job_parameters}
+            ):
+                JOBS.inc(job_type, JobStatus.FAILED.value)
+            return None
+
+        if await database.complete_job(job_id, data_references):
+            JOBS.inc(job_type, JobStatus.COMPLETED.value)
+        else:
+            logger.warning(f"job no longer processing, result dropped job_id={job_id}")
+            await payloads.delete([data_references])
+        return None
+
+    async def get_job(
+        self, job_id: str, user_id: str, columns: tuple[str, ...] = JOB_FIELDS
+    ) -> dict | None:
+        """Get job by ID (user-scoped) with only columns.
+
+        Completed/failed jobs are served from the terminal job cache, which holds full rows;
+        projected reads that miss it are not cached.
+        """
+        cache = get_terminal_job_cache()
+        job = cache.get(job_id, user_id)
+        if job is not None:
+            return job if columns == JOB_FIELDS else {c: job[c] for c in columns}
+        job = await database.get_job_by_id(job_id, user_id, columns)
+        if job is not None and columns == JOB_FIELDS:
+            cache.put(job_id, user_id, job)
+        return job
 
-    async def get_job(self, job_id: str, user_id: str) -> dict | None:
-        """Get job by ID (user-scoped)."""
-        return await database.get_job_by_id(job_id, user_id)
+    async def wait_for_job(self, job_id: str, user_id: str, timeout: float) -> dict | None:
+        """Long-poll: return the job once it is terminal, or as it is when timeout elapses.
+
+        None if not found.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        listener = get_job_status_listener()
+        # Subscribe before reading so a transition between the read and the wait is not missed.
+        with listener.subscribe(job_id) as events:
+            job = await self.get_job(job_id, user_id)
+            while job is not None and job["status"] not in TERMINAL_STATUSES:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    wait = min(remaining, self._recheck_seconds(listener))
+                    await asyncio.wait_for(events.get(), timeout=wait)
+                except TimeoutError:
+                    if loop.time() >= deadline:
+                        break
+                job = await self.get_job(job_id, user_id)
+            return job
+
+    async def job_events(
+        self, job_id: str, user_id: str, max_seconds: float
+    ) -> AsyncIterator[dict | None]:
+        """Yield the job on every status change until it is terminal.
+
+        None is an idle keepalive tick.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_seconds
+        listener = get_job_status_listener()
+        with listener.subscribe(job_id) as events:
+            job = await self.get_job(job_id, user_id)
+            if job is None:
+                return
+            yield job
+            last_status = job["status"]
+            while last_status not in TERMINAL_STATUSES and loop.time() < deadline:
+                try:
+                    await asyncio.wait_for(events.get(), timeout=self._recheck_seconds(listener))
+                except TimeoutError:
+                    pass
+                job = await self.get_job(job_id, user_id)
+                if job is None:
+                    return
+                if job["status"] != last_status:
+                    last_status = job["status"]
+                    yield job
+                else:
+                    yield None
+
+    @staticmethod
+    def _recheck_seconds(listener: JobStatusListener) -> float:
+        """DB re-check interval while waiting: rare with a live listener, frequent as a fallback."""
+        return 15.0 if listener.connected else 2.0
 
     async def list_jobs(
         self,
@@ -64,6 +306,58 @@ class JobQueueService:
         job_type: str | None = None,
         limit: int = 20,
         offset: int = 0,
-    ) -> tuple[list[dict], int]:
-        """List jobs (user-scoped)."""
-        return await database.list_jobs(user_id, status, job_type, limit, offset)
+        cursor: str | None = None,
+        include_total: bool = False,
+        columns: tuple[str, ...] = JOB_SUMMARY_FIELDS,
+    ) -> tuple[list[dict], int | None, str | None]:
+        """List jobs (user-scoped) with only columns. Returns (items, total, next_cursor)."""
+        return await database.list_jobs(
+            user_id, status, job_type, limit, offset, cursor, include_total, columns
+        )
+
+    async def recover_jobs(self, max_seconds: float | None = None) -> dict[str, int]:
+        """Re-queue (with backoff) or fail stuck and orphaned jobs in bounded, set-based chunks.
+
+        Returns counts per kind plus how many of them were retried rather than failed.
+        """
+        settings = load_settings()
+        batch_size = settings.recovery_batch_size
+        policies = registry.get_retry_policies()
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        counts = {"stuck": 0, "orphaned": 0, "retried": 0}
+
+        enqueue = settings.job_dispatch_mode != "spawn"
+        for kind, recover_chunk in (
+            ("stuck", database.recover_stuck_jobs),
+            ("orphaned", database.recover_orphaned_jobs),
+        ):
+            while deadline is None or time.monotonic() < deadline:
+                # Spawn mode re-dispatches retried jobs below instead of enqueueing lane messages.
+                recovered = await recover_chunk(batch_size, policies, enqueue=enqueue)
+                counts[kind] += len(recovered)
+                retried = []
+                for job in recovered:
+                    if job["status"] == JobStatus.PENDING.value:
+                        JOBS.inc(job["job_type"], "retried")
+                        retried.append(job)
+                    else:
+                        JOBS.inc(job["job_type"], JobStatus.FAILED.value)
+                counts["retried"] += len(retried)
+                if retried and settings.job_dispatch_mode == "spawn":
+                    # Recovery runs long after the failure, so the backoff has already elapsed.
+                    errors = await spawner.spawn_jobs(
+                        [
+                            {
+                                "job_id": str(job["id"]),
+                                "job_type": job["job_type"],
+                                "user_id": str(job["user_id"]),
+                                "job_parameters": job["job_parameters"],
+                            }
+                            for job in retried
+                        ]
+                    )
+                    for job_id, error in errors.items():
+                        logger.error(f"recovery re-dispatch failed job_id={job_id} error={error}")
+                if len(recovered) < batch_size:
+                    break
+        return counts
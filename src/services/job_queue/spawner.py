@@ -1,23 +1,49 @@
-"""Modal job spawner."""
-import modal
+"""Job spawner: hands jobs to the configured execution backend."""
+import time
 
-from src.models.config import load_settings
-from src.models.jobs.job_status import JobType
+from src.utils.logging import get_logger
+from src.utils.metrics import JOB_DISPATCH_DURATION
 
-# Map job types to Modal function names
-JOB_TIER_MAPPING = {
-    JobType.SAMPLE_TASK.value: "process_sample_job",
-}
+from .backends import get_execution_backend
 
+logger = get_logger(__name__)
 
-async def spawn_job(job_id: str, job_type: str, user_id: str, job_parameters: dict) -> None:
-    """Spawn job to Modal worker."""
-    func_name = JOB_TIER_MAPPING.get(job_type, "process_sample_job")
-    settings = load_settings()
-    app_name = f"Job-Worker-{settings.environment}"
 
+async def spawn_job(job_id: str, job_type: str, user_id: str, job_parameters: dict) -> None:
+    """Dispatch one job (Modal worker by default; see EXECUTION_BACKEND)."""
+    backend = get_execution_backend()
+    start = time.perf_counter()
     try:
-        func = modal.Function.from_name(app_name, func_name)
-        func.spawn(job_id, job_type, user_id, job_parameters)
-    except Exception as e:
-        raise RuntimeError(f"Failed to spawn job: {e}") from e
+        await backend.submit(
+            {
+                "job_id": job_id,
+                "job_type": job_type,
+                "user_id": user_id,
+                "job_parameters": job_parameters,
+            }
+        )
+    finally:
+        elapsed = time.perf_counter() - start
+        JOB_DISPATCH_DURATION.observe(elapsed, backend.name, job_type)
+        logger.debug(
+            f"job dispatched job_id={job_id} backend={backend.name} "
+            f"duration_ms={elapsed * 1000:.2f}"
+        )
+
+
+async def spawn_jobs(jobs: list[dict]) -> dict[str, str]:
+    """Dispatch many jobs (one spawn_map per Modal function).
+
+    Returns {job_id: error} for jobs not spawned.
+
+    Each job's dispatch latency is the time until its whole batch was handed off.
+    """
+    backend = get_execution_backend()
+    start = time.perf_counter()
+    errors = await backend.submit_many(jobs)
+    elapsed = time.perf_counter() - start
+    for job in jobs:
+        JOB_DISPATCH_DURATION.observe(elapsed, backend.name, job["job_type"])
+    logger.debug(f"jobs dispatched count={len(jobs)} failed={len(errors)} backend={backend.name} "
+                 f"duration_ms={elapsed * 1000:.2f}")
+    return errors
@@ -2,9 +2,13 @@
 import json
 import logging
 import sys
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any, Optional
 
+# Set by RequestIDMiddleware for the duration of a request.
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
 
 class StructuredFormatter(logging.Formatter):
     """JSON-structured formatter; includes request_id when in logRecord."""
@@ -16,8 +20,9 @@ class StructuredFormatter(logging.Formatter):
             "logger": record.name,
             "message": record.getMessage(),
         }
-        if hasattr(record, "request_id") and record.request_id:
-            log_obj["request_id"] = record.request_id
+        request_id = getattr(record, "request_id", None) or request_id_var.get()
+        if request_id:
+            log_obj["request_id"] = request_id
         return json.dumps(log_obj)
 
 
@@ -0,0 +1,177 @@
+"""In-process Prometheus metrics (counters, histograms, scrape-time gauges).
+
+Rendered in the Prometheus text exposition format.
+"""
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, TypeVar
+
+# Seconds; covers sub-ms DB calls up to multi-second requests.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, doc: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labelnames = labelnames
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} counter"]
+        for values, v in self._values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, values)} {_fmt(v)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels."""
+
+    def __init__(
+        self,
+        name: str,
+        doc: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.doc = doc
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # labelvalues -> [per-bucket counts (+Inf last), sum, count]
+        self._series: dict[LabelValues, list[Any]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        series = self._series.get(labelvalues)
+        if series is None:
+            series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} histogram"]
+        for values, (counts, total, count) in self._series.items():
+            cumulative = 0
+            for bound, c in zip((*self.buckets, float("inf")), counts):
+                cumulative += c
+                le = f'le="{_fmt(bound)}"'
+                labels = _labels(self.labelnames, values, le)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, values)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, values)} {count}")
+        return lines
+
+
+class Gauge:
+    """Point-in-time values, set at scrape time."""
+
+    def __init__(self, name: str, doc: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.doc = doc
+        self.labelnames = labelnames
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} gauge"]
+        for values, v in self._values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, values)} {_fmt(v)}")
+        return lines
+
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests.", ("method", "route", "status"))
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "Data-layer call latency.", ("function",)
+)
+DB_POOL_CONNECTIONS = Gauge("db_pool_connections", "asyncpg pool connections by state.", ("state",))
+QUEUE_DEPTH = Gauge("pgmq_queue_length", "Messages in the PGMQ queue.", ("queue",))
+QUEUE_OLDEST_AGE = Gauge(
+    "pgmq_oldest_message_age_seconds", "Age of the oldest PGMQ message.", ("queue",)
+)
+JOBS = Counter(
+    "jobs_total", "Job lifecycle events by job_type and resulting status.", ("job_type", "status")
+)
+JOB_DISPATCH_DURATION = Histogram(
+    "job_dispatch_duration_seconds",
+    "Time to hand a job to its execution backend.",
+    ("backend", "job_type"),
+)
+JOB_CACHE_REQUESTS = Counter("job_cache_requests_total", "Terminal job cache lookups.", ("result",))
+
+REGISTRY: list[Counter | Histogram | Gauge] = [
+    HTTP_REQUESTS,
+    HTTP_REQUEST_DURATION,
+    DB_QUERY_DURATION,
+    DB_POOL_CONNECTIONS,
+    QUEUE_DEPTH,
+    QUEUE_OLDEST_AGE,
+    JOBS,
+    JOB_DISPATCH_DURATION,
+    JOB_CACHE_REQUESTS,
+]
+
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# Innermost @observe_db function for the running task; tags per-query logs.
+db_function_var: ContextVar[str | None] = ContextVar("db_function", default=None)
+
+
+def observe_db(func: F) -> F:
+    """Record a data-layer coroutine's latency in DB_QUERY_DURATION, labelled by function name.
+
+    Also exposes the name via db_function_var so each query can be tagged with its caller.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        token = db_function_var.set(name)
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - start, name)
+            db_function_var.reset(token)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def render() -> str:
+    """All registered metrics in Prometheus text format 0.0.4."""
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,116 @@
+"""Per-query instrumentation: slow-query log and rolling per-statement latency stats.
+
+record_query is registered as an asyncpg query logger on every pooled connection, so it
+sees each statement's elapsed time; it runs in the caller's context, which carries the
+request_id and the calling data-layer function.
+"""
+import math
+import re
+from collections import deque
+from typing import Any
+
+from src.models.config import load_settings
+from src.utils.logging import get_logger, request_id_var
+from src.utils.metrics import db_function_var
+
+logger = get_logger(__name__)
+
+# Distinct statements tracked; the data layer has a small, fixed set.
+_MAX_STATEMENTS = 500
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+
+
+def normalize_sql(query: str) -> str:
+    """Collapse whitespace and replace literals with ? so equal statements group together."""
+    query = _STRING_LITERAL.sub("?", query)
+    query = _NUMBER_LITERAL.sub("?", query)
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+class _StatementStats:
+    __slots__ = ("count", "errors", "total", "window", "functions")
+
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.window: deque[float] = deque(maxlen=window)
+        self.functions: set[str] = set()
+
+
+_stats: dict[str, _StatementStats] = {}
+# Raw query text -> normalized SQL; avoids re-running the regexes for repeated statements.
+_normalized: dict[str, str] = {}
+
+
+def record_query(record: Any) -> None:
+    """asyncpg query logger callback (record is asyncpg's LoggedQuery)."""
+    settings = load_settings()
+    sql = _normalized.get(record.query)
+    if sql is None:
+        sql = normalize_sql(record.query)
+        if len(_normalized) < _MAX_STATEMENTS:
+            _normalized[record.query] = sql
+
+    function = db_function_var.get()
+    stats = _stats.get(sql)
+    if stats is None:
+        if len(_stats) >= _MAX_STATEMENTS:
+            stats = None
+        else:
+            stats = _stats[sql] = _StatementStats(settings.query_stats_window)
+    if stats is not None:
+        stats.count += 1
+        stats.total += record.elapsed
+        stats.window.append(record.elapsed)
+        if record.exception is not None:
+            stats.errors += 1
+        if function:
+            stats.functions.add(function)
+
+    elapsed_ms = record.elapsed * 1000
+    if elapsed_ms >= settings.slow_query_ms:
+        logger.warning(
+            f"slow query function={function} duration_ms={elapsed_ms:.2f} sql={sql}",
+            extra={"request_id": request_id_var.get()},
+        )
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending, non-empty list."""
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def get_query_stats() -> list[dict[str, Any]]:
+    """Per-statement stats, slowest p95 first.
+
+    Percentiles cover the last query_stats_window calls.
+    """
+    out = []
+    for sql, stats in list(_stats.items()):
+        window = sorted(stats.window)
+        if not window:
+            continue
+        out.append(
+            {
+                "sql": sql,
+                "functions": sorted(stats.functions),
+                "count": stats.count,
+                "errors": stats.errors,
+                "mean_ms": stats.total / stats.count * 1000,
+                "p50_ms": _percentile(window, 50) * 1000,
+                "p95_ms": _percentile(window, 95) * 1000,
+                "p99_ms": _percentile(window, 99) * 1000,
+            }
+        )
+    out.sort(key=lambda s: s["p95_ms"], reverse=True)
+    return out
+
+
+def reset_query_stats() -> None:
+    """Clear collected stats."""
+    _stats.clear()
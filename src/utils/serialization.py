@@ -0,0 +1,30 @@
+"""Fast JSON (orjson) shared by the asyncpg codecs, queue messages and API responses."""
+from typing import Any
+
+import orjson
+
+# UTC datetimes as "...Z" (as Pydantic writes them); non-str keys (e.g. ints) instead of TypeError.
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+# PostgreSQL's binary jsonb format is a version byte followed by the JSON text.
+_JSONB_VERSION = b"\x01"
+
+
+def dumps(value: Any) -> bytes:
+    """JSON bytes; UUID, datetime and date are serialized natively."""
+    return orjson.dumps(value, option=_OPTIONS)
+
+
+def loads(data: bytes | str) -> Any:
+    """Parse JSON bytes or text."""
+    return orjson.loads(data)
+
+
+def encode_jsonb(value: Any) -> bytes:
+    """asyncpg binary jsonb encoder."""
+    return _JSONB_VERSION + orjson.dumps(value, option=_OPTIONS)
+
+
+def decode_jsonb(data: bytes) -> Any:
+    """asyncpg binary jsonb decoder."""
+    return orjson.loads(data[1:])